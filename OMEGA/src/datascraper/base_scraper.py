@@ -1,11 +1,96 @@
 import json
 import time
 import os
-from urllib.request import urlopen
-from urllib.error import HTTPError, URLError
-from datetime import datetime
+import threading
+import zlib
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.client import HTTPException
+from datetime import datetime, timedelta, timezone
+
+from rate_limiter import TokenBucket
+from retry_policy import RetryPolicy
+from response_cache import ResponseCache
+from checkpoint import SessionCheckpoint
+from driver_registry import DriverRegistry, UNKNOWN_TEAM
+from http_transport import HttpTransport, HttpStatusError, STREAM_CHUNK_BYTES
+from json_stream import iter_json_array
 
 DELAY = 1
+MAX_WORKERS = 4  # maximum number of HTTP requests in flight at the same time
+REQUESTS_PER_SECOND = 1 / DELAY  # average request rate allowed by the shared rate limiter
+BURST = 3  # number of requests that may be issued back to back before throttling
+HISTORICAL_AFTER = timedelta(days=1)  # sessions that ended this long ago are treated as immutable
+
+# Lap fields kept from the /v1/laps endpoint; everything else is dropped while parsing.
+LAP_FIELDS = ("driver_number", "lap_number", "date_start", "lap_duration", "st_speed",
+              "duration_sector_1", "duration_sector_2", "duration_sector_3")
+
+# Fields of every per-session endpoint that processing and the CSV export read.
+ENDPOINT_FIELDS = {
+    "drivers": ("driver_number", "full_name", "team_name"),
+    "laps": LAP_FIELDS,
+    "stints": ("driver_number", "lap_start", "lap_end", "lap_number", "compound", "tyre_age",
+               "tyre_age_at_start"),
+    "weather": ("date", "air_temperature", "rainfall", "track_temp", "wind_direction", "wind_speed",
+                "weather", "condition"),
+}
+
+
+def make_projection(fields):
+    """
+    Build a json.loads object_hook keeping only the given fields of every record, so the fields
+    nobody reads are dropped as soon as each record is parsed.
+
+    Args:
+        fields (tuple): Field names to keep.
+    Returns:
+        A function mapping a parsed JSON object to a dictionary with only those fields.
+    """
+    def project(record):
+        return {field: record[field] for field in fields if field in record}
+    return project
+
+
+class Lap:
+    """
+    A single lap of a driver, with the lap fields used downstream plus the attached tire and weather data.
+
+    Laps are kept as __slots__ objects rather than dictionaries while a session is processed, which
+    makes each lap a fraction of the size of the parsed API record. to_dict() gives the JSON form.
+    """
+    __slots__ = LAP_FIELDS + ("tire_data", "weather_data")
+
+    def __init__(self, record: dict, lap_duration: float):
+        """
+        Create a lap from a projected /v1/laps record.
+
+        Args:
+            record (dict): Lap record from the API.
+            lap_duration (float): Lap duration already converted to float.
+        """
+        for field in LAP_FIELDS:
+            setattr(self, field, record.get(field))
+        self.lap_duration = lap_duration
+        self.tire_data = None
+        self.weather_data = None
+
+    def to_dict(self) -> dict:
+        """
+        Return the lap as a dictionary (the format written to the scraped JSON files).
+        "weather_data" is left out of laps without weather, as before laps were slotted objects.
+        """
+        lap = {field: getattr(self, field) for field in self.__slots__}
+        if lap["weather_data"] is None:
+            del lap["weather_data"]
+        return lap
+
+
+class IncompleteResponseError(Exception):
+    """
+    Raised when a streamed response breaks off after part of it was already consumed.
+    """
+
 
 class BaseScraper:
     """
@@ -15,20 +100,46 @@ class BaseScraper:
          year (str): The season year to scrape.
          output_prefix (str): Prefix used for the output filename.
          last_year_compound (str): Fallback tire compound if no tire data is found.
-         reference_drivers (dict): Reference data for drivers from a complete session.
+         driver_registry (DriverRegistry): Teams of the season's drivers, used to fill missing team names.
+         max_workers (int): Concurrency cap for sessions processed and HTTP requests in flight.
+         rate_limiter (TokenBucket): Rate limiter shared by every request of this scraper.
+         cache (ResponseCache): On-disk response cache, or None when caching is disabled.
+         historical_sessions (set): Keys of finished sessions whose responses never change.
+         transport (HttpTransport): Pooled keep-alive HTTP client used for every request.
+         retry_policy (RetryPolicy): Retry rounds for sessions that are still incomplete.
      """
-    def __init__(self, year: str, last_year_compound="SOFT"):
+    def __init__(self, year: str, last_year_compound="SOFT", max_workers=MAX_WORKERS, rate_limiter=None,
+                 cache=None, use_cache=True, transport=None, in_flight=None, retry_policy=None, progress=None):
         """
         Initialize a new BaseScraper instance.
 
         Args:
             year (str): Season year to be scraped.
             last_year_compound (str): Fallback compound value if tire data is missing.
+            max_workers (int): Maximum number of concurrent requests/sessions (1 = serial).
+            rate_limiter (TokenBucket): Optional rate limiter to share between several scrapers.
+            cache (ResponseCache): Optional response cache; a default on-disk cache is used if omitted.
+            use_cache (bool): Set to False to always fetch from the network.
+            transport (HttpTransport): Optional HTTP client to share between scrapers or to point
+                at a stub server; a pooled transport is created if omitted.
+            in_flight (threading.Semaphore): Optional semaphore capping the requests in flight,
+                to share one cap between several scrapers; defaults to max_workers per scraper.
+            retry_policy (RetryPolicy): How incomplete sessions are retried at the end of run().
+            progress: Optional object notified of planned (add_planned(count)) and processed
+                (session_done()) sessions, e.g. the orchestrator's progress reporter.
         """
         self.year = year
         self.output_prefix = "output"  # used in output filename
         self.last_year_compound = last_year_compound  # fallback compound if not raining
-        self.reference_drivers = None  # reference driver data from a complete session
+        self.driver_registry = DriverRegistry()  # replaced by the checkpoint's registry in run()
+        self.max_workers = max(1, int(max_workers))
+        self.rate_limiter = rate_limiter or TokenBucket(REQUESTS_PER_SECOND, BURST)
+        self._in_flight = in_flight or threading.BoundedSemaphore(self.max_workers)
+        self.cache = (cache or ResponseCache()) if use_cache else None
+        self.historical_sessions = set()
+        self.transport = transport or HttpTransport(pool_size=self.max_workers)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.progress = progress
 
     @staticmethod
     def safe_field(value, default):
@@ -47,32 +158,45 @@ class BaseScraper:
             return default
         return value
 
-    def fetch_json(self, url: str):
+    def fetch_json(self, url: str, immutable=False, fields=None):
         """
         Fetch JSON data from the specified URL with retry logic for transient errors.
+        Responses are served from the response cache when a fresh entry exists.
 
         Args:
             url (str): The URL to fetch data from.
+            immutable (bool): True if the response can never change (finished session).
+            fields (tuple): If given, only these fields of each record are kept (see ENDPOINT_FIELDS).
+                The cache always stores the complete response.
         Returns:
             Parsed JSON data if successful; otherwise, None.
         """
+        object_hook = make_projection(fields) if fields else None
+        if self.cache is not None:
+            body = self.cache.get(url, self.cache.ttl_for(url, immutable))
+            if body is not None:
+                try:
+                    return json.loads(body.decode("utf-8"), object_hook=object_hook)
+                except ValueError:
+                    print("Ignoring corrupt cache entry for", url)
+            if self.cache.offline:
+                print("Offline mode: no cached response for", url)
+                return None
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                with urlopen(url) as response:
-                    data = json.loads(response.read().decode("utf-8"))
-                time.sleep(DELAY)
+                self.rate_limiter.acquire()
+                with self._in_flight:
+                    body = self.transport.get(url)
+                data = json.loads(body.decode("utf-8"), object_hook=object_hook)
+                if self.cache is not None:
+                    self.cache.put(url, body)
                 return data
-            except HTTPError as e:
-                if e.code in [429, 500]:
-                    wait_time = DELAY * (attempt + 1)
-                    print(f"HTTP Error {e.code} for {url}. Waiting {wait_time} seconds before retry (attempt {attempt+1}/{max_retries})...")
-                    time.sleep(wait_time)
+            except HttpStatusError as e:
+                if self.wait_before_retry(e, url, attempt, max_retries):
                     continue
-                else:
-                    print("HTTP error fetching", url, ":", e)
-                    break
-            except URLError as e:
+                break
+            except (OSError, HTTPException) as e:
                 print("URL error fetching", url, ":", e)
                 break
             except Exception as e:
@@ -80,6 +204,140 @@ class BaseScraper:
                 break
         return None
 
+    def wait_before_retry(self, error: HttpStatusError, url: str, attempt: int, max_retries: int) -> bool:
+        """
+        Decide whether a failed request is retried, and wait before the retry.
+        Rate limiting (429) and server errors (500) are retried; other status codes are not.
+
+        Args:
+            error (HttpStatusError): The HTTP error of the failed attempt.
+            url (str): Requested URL.
+            attempt (int): Zero-based number of the failed attempt.
+            max_retries (int): Total number of attempts.
+        Returns:
+            True if the request should be sent again.
+        """
+        if error.code not in [429, 500]:
+            print("HTTP error fetching", url, ":", error)
+            return False
+        wait_time = DELAY * (attempt + 1)
+        if error.code == 429 and error.retry_after is not None:
+            # The server told us how long to back off.
+            wait_time = error.retry_after
+        print(f"HTTP Error {error.code} for {url}. Waiting {wait_time} seconds before retry (attempt {attempt+1}/{max_retries})...")
+        if error.code == 429:
+            # Hold back every thread sharing the limiter, not just this one.
+            self.rate_limiter.penalize(wait_time)
+        else:
+            time.sleep(wait_time)
+        return True
+
+    def stream_json(self, url: str, immutable=False, fields=None):
+        """
+        Fetch a JSON array from the specified URL and yield its records as they are parsed.
+
+        Unlike fetch_json(), the response is never held in memory as a whole: the body is read in
+        chunks, parsed incrementally and, on a cache miss, written to the response cache chunk by
+        chunk. Cached bodies are streamed from disk the same way. Requests that fail before the
+        first record are retried like in fetch_json(); a response that breaks off after records
+        were yielded raises IncompleteResponseError, since the caller already consumed part of it.
+        An in-flight slot is held only while a chunk is received, not while the caller processes
+        the records parsed from it.
+
+        Args:
+            url (str): The URL to fetch data from.
+            immutable (bool): True if the response can never change (finished session).
+            fields (tuple): If given, only these fields of each record are kept (see ENDPOINT_FIELDS).
+        Yields:
+            The records of the array (nothing if the request failed or the body is not an array).
+        Raises:
+            IncompleteResponseError: If the response broke off after records were yielded.
+        """
+        object_hook = make_projection(fields) if fields else None
+        yielded = False
+        if self.cache is not None:
+            body_file = self.cache.open(url, self.cache.ttl_for(url, immutable))
+            if body_file is not None:
+                with body_file:
+                    try:
+                        for record in iter_json_array(iter(lambda: body_file.read(STREAM_CHUNK_BYTES), b""),
+                                                      object_hook):
+                            yielded = True
+                            yield record
+                        return
+                    except ValueError as e:
+                        self.cache.discard(url)
+                        if yielded:
+                            raise IncompleteResponseError(f"Corrupt cache entry for {url}") from e
+                        print("Ignoring corrupt cache entry for", url)
+            if self.cache.offline:
+                print("Offline mode: no cached response for", url)
+                return
+        max_retries = 3
+        for attempt in range(max_retries):
+            writer = None
+            try:
+                self.rate_limiter.acquire()
+                stream = self.transport.stream(url)
+                try:
+                    chunks = self._chunks_in_flight(stream)
+                    first = next(chunks, b"")
+                    if self.cache is not None:
+                        writer = self.cache.writer(url)
+                    body = self._tee_chunks(first, chunks, writer)
+                    for record in iter_json_array(body, object_hook):
+                        yielded = True
+                        yield record
+                    # Read past the end of the array so the body is cached whole.
+                    for _ in body:
+                        pass
+                finally:
+                    stream.close()
+                if writer is not None:
+                    writer.commit()
+                    writer = None
+                return
+            except HttpStatusError as e:
+                if self.wait_before_retry(e, url, attempt, max_retries):
+                    continue
+                break
+            except (OSError, HTTPException, ValueError, zlib.error) as e:
+                if yielded:
+                    raise IncompleteResponseError(f"Response from {url} broke off: {e}") from e
+                print("URL error fetching" if isinstance(e, (OSError, HTTPException)) else "Error fetching",
+                      url, ":", e)
+                break
+            finally:
+                if writer is not None:
+                    writer.abort()
+
+    def _chunks_in_flight(self, stream):
+        """
+        Yield the chunks of a transport stream, holding an in-flight slot only while a chunk is
+        being received (the first one includes sending the request). The caller's work on the
+        records in between does not keep other requests waiting for a slot.
+        """
+        while True:
+            with self._in_flight:
+                chunk = next(stream, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    @staticmethod
+    def _tee_chunks(first: bytes, chunks, writer):
+        """
+        Yield the first chunk and then the remaining ones, copying each into the cache writer (if any).
+        """
+        if first:
+            if writer is not None:
+                writer.write(first)
+            yield first
+        for chunk in chunks:
+            if writer is not None:
+                writer.write(chunk)
+            yield chunk
+
     def fetch_sessions(self):
         """
         Fetch race sessions for the given year.
@@ -89,6 +347,50 @@ class BaseScraper:
         """
         raise NotImplementedError("Subclasses must implement the fetch_sessions method!")
 
+    def is_historical(self, session_key) -> bool:
+        """
+        Check whether a session is finished long enough ago that its data can no longer change.
+
+        Args:
+            session_key: Unique key identifying the session.
+        Returns:
+            True if the session's responses can be cached forever.
+        """
+        return str(session_key) in self.historical_sessions
+
+    def mark_historical_sessions(self, sessions: list):
+        """
+        Remember which of the given sessions ended more than HISTORICAL_AFTER ago.
+
+        Args:
+            sessions (list): Raw session dictionaries (with "date_end").
+        """
+        now = datetime.now(timezone.utc)
+        for session in sessions:
+            try:
+                date_end = datetime.fromisoformat(session.get("date_end"))
+            except (TypeError, ValueError):
+                continue
+            if date_end.tzinfo is None:
+                date_end = date_end.replace(tzinfo=timezone.utc)
+            if now - date_end > HISTORICAL_AFTER:
+                self.historical_sessions.add(str(session.get("session_key")))
+
+    def invalidate_sessions(self, sessions: list):
+        """
+        Drop cached responses of sessions that are about to be re-scraped, unless they are
+        historical (re-fetching finished sessions would return the same data).
+
+        Args:
+            sessions (list): Raw session dictionaries.
+        """
+        if self.cache is None or self.cache.offline:
+            return
+        for session in sessions:
+            session_key = session.get("session_key")
+            if not self.is_historical(session_key):
+                self.cache.invalidate_session(session_key)
+
     def fetch_drivers(self, session_key: str):
         """
         Fetch driver data for a specific session.
@@ -99,9 +401,20 @@ class BaseScraper:
             A list of driver dictionaries if the data is valid; otherwise, an empty list.
         """
         url = f"https://api.openf1.org/v1/drivers?session_key={session_key}"
-        data = self.fetch_json(url)
+        data = self.fetch_json(url, immutable=self.is_historical(session_key),
+                               fields=ENDPOINT_FIELDS["drivers"])
         return data if isinstance(data, list) else []
 
+    @staticmethod
+    def laps_url(session_key: str) -> str:
+        """
+        Return the laps URL of a session; pit-out laps and laps of 120 seconds or more are filtered by the API.
+        """
+        return (
+            f"https://api.openf1.org/v1/laps?session_key={session_key}"
+            "&is_pit_out_lap=false&lap_duration%3C=120"
+        )
+
     def fetch_laps(self, session_key: str):
         """
         Fetch lap data for a specific session, filtering out pit laps and laps longer than 120 seconds.
@@ -111,13 +424,60 @@ class BaseScraper:
         Returns:
             A list of lap dictionaries if the data is valid; otherwise, an empty list.
         """
-        url = (
-            f"https://api.openf1.org/v1/laps?session_key={session_key}"
-            "&is_pit_out_lap=false&lap_duration%3C=120"
-        )
-        data = self.fetch_json(url)
+        data = self.fetch_json(self.laps_url(session_key), immutable=self.is_historical(session_key),
+                               fields=ENDPOINT_FIELDS["laps"])
         return data if isinstance(data, list) else []
 
+    def stream_laps(self, session_key: str):
+        """
+        Yield the lap records of a session one at a time as the laps response is parsed.
+
+        Args:
+            session_key (str): Unique key identifying the session.
+        Yields:
+            Lap dictionaries (projected to ENDPOINT_FIELDS["laps"]).
+        Raises:
+            IncompleteResponseError: If the response broke off part way.
+        """
+        yield from self.stream_json(self.laps_url(session_key), immutable=self.is_historical(session_key),
+                                    fields=ENDPOINT_FIELDS["laps"])
+
+    @staticmethod
+    def collect_laps(lap_records):
+        """
+        Turn lap records into Lap objects per driver while they are being received, keeping only
+        laps under 120 seconds and tracking each driver's fastest lap along the way.
+
+        Args:
+            lap_records (iterable): Lap dictionaries, e.g. from stream_laps().
+        Returns:
+            A tuple (driver_all_laps, fastest_laps, received): the laps per driver number, the
+            fastest Lap per driver number and the number of records received.
+        """
+        driver_all_laps = {}
+        fastest_laps = {}
+        received = 0
+        for lap in lap_records:
+            received += 1
+            driver_num = lap.get("driver_number")
+            if driver_num is None:
+                continue
+            lap_duration = lap.get("lap_duration")
+            if lap_duration is None:
+                continue
+            try:
+                lap_duration_val = float(lap_duration)
+            except (ValueError, TypeError):
+                continue
+            if lap_duration_val < 120:
+                lap_record = Lap(lap, lap_duration_val)
+                driver_all_laps.setdefault(driver_num, []).append(lap_record)
+                # Identify the fastest lap per driver.
+                if (driver_num not in fastest_laps or
+                        lap_duration_val < fastest_laps[driver_num].lap_duration):
+                    fastest_laps[driver_num] = lap_record
+        return driver_all_laps, fastest_laps, received
+
     def fetch_tires(self, session_key: str):
         """
         Fetch tire stint data for a specific session.
@@ -128,7 +488,8 @@ class BaseScraper:
             A list of tire stint dictionaries if the data is valid; otherwise, an empty list.
         """
         url = f"https://api.openf1.org/v1/stints?session_key={session_key}"
-        data = self.fetch_json(url)
+        data = self.fetch_json(url, immutable=self.is_historical(session_key),
+                               fields=ENDPOINT_FIELDS["stints"])
         return data if isinstance(data, list) else []
 
     def fetch_weather(self, session_key: str):
@@ -141,77 +502,113 @@ class BaseScraper:
             A list of weather dictionaries if the data is valid; otherwise, an empty list.
         """
         url = f"https://api.openf1.org/v1/weather?session_key={session_key}"
-        data = self.fetch_json(url)
+        data = self.fetch_json(url, immutable=self.is_historical(session_key),
+                               fields=ENDPOINT_FIELDS["weather"])
         return data if isinstance(data, list) else []
 
-    def get_closest_weather(self, lap_datetime: datetime, weather_list: list):
+    def fetch_session_data(self, session_key: str):
+        """
+        Fetch drivers, tire stints and weather for a session while its laps are streamed through
+        collect_laps(). The drivers, stints and weather calls run in parallel with the lap stream
+        unless the scraper runs serially.
+
+        Args:
+            session_key (str): Unique key identifying the session.
+        Returns:
+            A dictionary with the "drivers", "stints" and "weather" lists and the "laps" tuple
+            returned by collect_laps() (None if the laps response broke off).
+        """
+        fetchers = {
+            "drivers": self.fetch_drivers,
+            "stints": self.fetch_tires,
+            "weather": self.fetch_weather,
+        }
+
+        def collect():
+            try:
+                return self.collect_laps(self.stream_laps(session_key))
+            except IncompleteResponseError as e:
+                print(f"Session {session_key}: {e}")
+                return None
+
+        if self.max_workers == 1:
+            session_data = {name: fetch(session_key) for name, fetch in fetchers.items()}
+            session_data["laps"] = collect()
+            return session_data
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+            futures = {name: executor.submit(fetch, session_key) for name, fetch in fetchers.items()}
+            laps = collect()
+            session_data = {name: future.result() for name, future in futures.items()}
+        session_data["laps"] = laps
+        return session_data
+
+    @staticmethod
+    def build_weather_index(weather_list: list):
+        """
+        Sort the weather records of a session by timestamp once, so that lookups can use binary search.
+        Records without a "parsed_date" are skipped; records with equal timestamps keep their original order.
+
+        Args:
+            weather_list (list): List of weather records (each with a "parsed_date").
+        Returns:
+            A tuple (dates, records) of the sorted timestamps and the matching weather records.
+        """
+        records = sorted((record for record in weather_list if record.get("parsed_date") is not None),
+                         key=lambda record: record["parsed_date"])
+        return [record["parsed_date"] for record in records], records
+
+    def get_closest_weather(self, lap_datetime: datetime, weather_index: tuple):
         """
         Find the weather record with the closest timestamp to the given lap datetime.
+        If a record before and a record after the lap are equally close, the earlier one wins;
+        among records with the same timestamp, the first one of the original list wins.
 
         Args:
             lap_datetime (datetime): The datetime of the lap start.
-            weather_list (list): List of weather records (each with a "parsed_date").
+            weather_index (tuple): Sorted (dates, records) built by build_weather_index().
         Returns:
             The weather record closest to lap_datetime with "parsed_date" removed; otherwise, None.
         """
+        dates, records = weather_index
+        # dates[position - 1] <= lap_datetime < dates[position]
+        position = bisect_right(dates, lap_datetime)
         best_record = None
-        best_diff = float("inf")
-        for record in weather_list:
-            parsed = record.get("parsed_date")
-            if parsed is None:
-                continue
-            diff = abs((lap_datetime - parsed).total_seconds())
-            if diff < best_diff:
-                best_diff = diff
-                best_record = record
-            elif diff == best_diff:
-                if record["parsed_date"] <= lap_datetime and best_record["parsed_date"] > lap_datetime:
-                    best_record = record
+        if position > 0:
+            before = bisect_left(dates, dates[position - 1], 0, position)
+            best_record = records[before]
+            best_diff = abs((lap_datetime - dates[before]).total_seconds())
+        if position < len(dates):
+            diff = abs((lap_datetime - dates[position]).total_seconds())
+            if best_record is None or diff < best_diff:
+                best_record = records[position]
         if best_record is not None:
             sanitized = best_record.copy()
             sanitized.pop("parsed_date", None)
             return sanitized
         return None
 
-    def find_reference_driver_data(self):
+    @staticmethod
+    def build_lap_index(driver_all_laps: dict):
         """
-        Find a session with complete driver data (i.e., all drivers have a number, full name, and team)
-        to be used as reference for filling missing information in other sessions.
+        Index each driver's laps by their integer lap number, so tire stints can be mapped onto laps
+        without rescanning every lap. Laps whose number cannot be parsed are left out.
 
+        Args:
+            driver_all_laps (dict): Mapping of driver number to the driver's list of Lap objects.
         Returns:
-            A dictionary mapping driver keys to driver info, or None if not found.
+            A dictionary mapping driver number to {lap number: [laps with that number]}.
         """
-        sessions = self.fetch_sessions()
-        for session in sessions:
-            session_key = session.get("session_key")
-            drivers_data = self.fetch_drivers(session_key)
-            all_complete = True
-            for driver in drivers_data:
-                if not (driver.get("driver_number") and driver.get("full_name") and
-                        driver.get("team_name") and driver.get("team_name").strip() != ""):
-                    all_complete = False
-                    break
-            if all_complete and drivers_data:
-                ref = {}
-                for driver in drivers_data:
-                    num = driver.get("driver_number")
-                    name = driver.get("full_name")
-                    team = driver.get("team_name")
-                    if num is not None and str(num).strip() != "":
-                        key = f"num:{str(num).strip()}"
-                    elif name is not None and name.strip() != "":
-                        key = f"name:{name.strip()}"
-                    else:
-                        key = None
-                    if key:
-                        ref[key] = {"driver_number": num, "full_name": name, "team_name": team}
-                if ref:
-                    print(f"Reference driver data found from session {session_key}")
-                    return ref
-            else:
-                print(f"Session {session.get('session_key')} has incomplete driver data. Trying next session...")
-        print("WARNING: No complete reference driver data found.")
-        return None
+        lap_index = {}
+        for driver_num, laps in driver_all_laps.items():
+            laps_by_number = {}
+            for lap in laps:
+                try:
+                    lnum = int(lap.lap_number)
+                except (ValueError, TypeError):
+                    continue
+                laps_by_number.setdefault(lnum, []).append(lap)
+            lap_index[driver_num] = laps_by_number
+        return lap_index
 
     def is_session_complete(self, session_result: dict) -> bool:
         """
@@ -236,25 +633,27 @@ class BaseScraper:
         Process a single session by aggregating drivers, laps, tire, and weather data.
 
         Steps:
-            1. Fetch driver data and build driver/team mappings.
-            2. Use reference driver data (if available) to fill missing team info.
-            3. Fetch lap data, process each lap, and determine the fastest lap per driver.
-            4. Fetch tire data and map tire stints to corresponding laps.
-            5. Apply fallback tire data if missing.
-            6. Fetch weather data and attach the closest weather record to each lap.
-            7. Assemble and return the final session result.
+            1. Fetch driver, tire and weather data (concurrently when enabled) while streaming the laps,
+               keeping laps under 120 seconds and the fastest lap per driver as they arrive.
+            2. Build driver/team mappings, record them in the driver registry and fill missing team info from it.
+            3. Map tire stints to corresponding laps.
+            4. Apply fallback tire data if missing.
+            5. Attach the closest weather record to each lap.
+            6. Assemble and return the final session result.
 
         Args:
             session (dict): Raw session data.
         Returns:
-            Tuple containing the session key and the processed session result dictionary.
+            Tuple containing the session key and the processed session result dictionary
+            (laps are Lap objects; SessionCheckpoint writes them as dictionaries).
         """
         session_key = session.get("session_key")
         # Extract circuit_short_name from the session object (default "UNKNOWN")
         circuit_short_name = session.get("circuit_short_name", "UNKNOWN")
         print(f"\nProcessing session: {session_key} (Circuit: {circuit_short_name})")
 
-        drivers_data = self.fetch_drivers(session_key)
+        session_data = self.fetch_session_data(session_key)
+        drivers_data = session_data["drivers"]
         if not drivers_data:
             print(f"Session {session_key}: No driver data returned.")
             return session_key, {}
@@ -286,62 +685,34 @@ class BaseScraper:
                 driver["full_name"] = name
                 driver["team_name"] = team
 
-        if self.reference_drivers:
-            for driver in drivers_data:
-                team = driver.get("team_name")
-                if not (team and team.strip() != ""):
-                    num = driver.get("driver_number")
-                    name = driver.get("full_name")
-                    key = None
-                    if num is not None and str(num).strip() != "":
-                        key = f"num:{str(num).strip()}"
-                    elif name is not None and name.strip() != "":
-                        key = f"name:{name.strip()}"
-                    if key and key in self.reference_drivers:
-                        driver["team_name"] = self.reference_drivers[key].get("team_name")
+        # Remember this session's teams and fill missing ones from the sessions seen so far.
+        date_start = session.get("date_start")
+        self.driver_registry.record(session_key, date_start, drivers_data)
+        self.driver_registry.fill_missing_teams(drivers_data, date_start)
         # Build drivers and teams info for later CSV generation.
         drivers_info = {}
         teams = {}
         for driver in drivers_data:
             driver_num = self.safe_field(driver.get("driver_number"), "UNKNOWN")
-            team_name = self.safe_field(driver.get("team_name"), "UNKNOWN TEAM")
+            team_name = self.safe_field(driver.get("team_name"), UNKNOWN_TEAM)
             full_name = self.safe_field(driver.get("full_name"), "UNKNOWN DRIVER")
             drivers_info[driver_num] = {"team": team_name, "name": full_name}
             teams.setdefault(team_name, []).append(driver_num)
-        # Process lap data.
-        laps_data = self.fetch_laps(session_key)
-        if not laps_data:
+        # Lap data was filtered and reduced to the fastest lap per driver while it was received.
+        if not session_data["laps"] or not session_data["laps"][2]:
             print(f"Session {session_key}: No lap data returned.")
             return session_key, {}
-        driver_all_laps = {}
-        fastest_laps = {}
-        for lap in laps_data:
-            driver_num = lap.get("driver_number")
-            if driver_num is None:
-                continue
-            lap_duration = lap.get("lap_duration")
-            if lap_duration is None:
-                continue
-            try:
-                lap_duration_val = float(lap_duration)
-            except (ValueError, TypeError):
-                continue
-            if lap_duration_val < 120:
-                lap_copy = lap.copy()
-                lap_copy["lap_duration"] = lap_duration_val
-                driver_all_laps.setdefault(driver_num, []).append(lap_copy)
-                # Identify the fastest lap per driver.
-                if (driver_num not in fastest_laps or
-                        lap_duration_val < fastest_laps[driver_num]["lap_duration"]):
-                    fastest_laps[driver_num] = lap_copy
+        driver_all_laps, fastest_laps, _ = session_data["laps"]
 
         # Process tire stint data and assign tire info to laps.
-        stints = self.fetch_tires(session_key)
+        stints = session_data["stints"]
         if stints:
+            lap_index = self.build_lap_index(driver_all_laps)
             for stint in stints:
                 driver_num = stint.get("driver_number")
                 if driver_num is None or driver_num not in driver_all_laps:
                     continue
+                laps_by_number = lap_index[driver_num]
                 lap_start = stint.get("lap_start")
                 lap_end = stint.get("lap_end")
                 if lap_start is not None and lap_end is not None:
@@ -350,13 +721,13 @@ class BaseScraper:
                         end = int(lap_end)
                     except (ValueError, TypeError):
                         continue
-                    for lap in driver_all_laps.get(driver_num, []):
-                        try:
-                            lnum = int(lap.get("lap_number"))
-                        except (ValueError, TypeError):
-                            continue
-                        if start <= lnum <= end:
-                            lap["tire_data"] = stint
+                    if end - start < len(laps_by_number):
+                        lap_numbers = [lnum for lnum in range(start, end + 1) if lnum in laps_by_number]
+                    else:
+                        lap_numbers = [lnum for lnum in laps_by_number if start <= lnum <= end]
+                    for lnum in lap_numbers:
+                        for lap in laps_by_number[lnum]:
+                            lap.tire_data = stint
                 else:
                     specific_lap = stint.get("lap_number")
                     if specific_lap is not None:
@@ -364,26 +735,21 @@ class BaseScraper:
                             specific_lap = int(specific_lap)
                         except (ValueError, TypeError):
                             continue
-                        for lap in driver_all_laps.get(driver_num, []):
-                            try:
-                                lnum = int(lap.get("lap_number"))
-                            except (ValueError, TypeError):
-                                continue
-                            if lnum == specific_lap:
-                                lap["tire_data"] = stint
+                        for lap in laps_by_number.get(specific_lap, []):
+                            lap.tire_data = stint
 
         # Apply fallback tire data if missing in any lap.
         missing_tire_flag = False
         for driver, laps in driver_all_laps.items():
             for lap in laps:
-                if "tire_data" not in lap:
-                    weather = lap.get("weather_data") or {}
+                if lap.tire_data is None:
+                    weather = lap.weather_data or {}
                     description = (weather.get("weather") or weather.get("condition") or "").lower()
                     if "rain" in description:
                         compound = "INTERMEDIATE"
                     else:
                         compound = self.last_year_compound
-                    lap["tire_data"] = {
+                    lap.tire_data = {
                         "compound": compound,
                         "note": "Fallback: filled using last year's tire data due to missing info."
                     }
@@ -392,31 +758,32 @@ class BaseScraper:
             print("WARNING: Some laps were missing tire data. Fallback tire data have been applied.")
 
         # Process weather data and attach closest weather record to each lap.
-        weather_data = self.fetch_weather(session_key)
+        weather_data = session_data["weather"]
         if weather_data:
             for w in weather_data:
                 try:
                     w["parsed_date"] = datetime.fromisoformat(w.get("date"))
                 except Exception:
                     w["parsed_date"] = None
+            weather_index = self.build_weather_index(weather_data)
             for driver, laps in driver_all_laps.items():
                 for lap in laps:
-                    lap_start_str = lap.get("date_start")
+                    lap_start_str = lap.date_start
                     if not lap_start_str:
                         continue
                     try:
                         lap_dt = datetime.fromisoformat(lap_start_str)
                     except Exception:
                         continue
-                    closest_weather = self.get_closest_weather(lap_dt, weather_data)
-                    lap["weather_data"] = closest_weather
+                    closest_weather = self.get_closest_weather(lap_dt, weather_index)
+                    lap.weather_data = closest_weather
 
         # Ensure tire compound is set correctly based on weather when "UNKNOWN".
         for driver, laps in driver_all_laps.items():
             for lap in laps:
-                tire = lap.get("tire_data")
+                tire = lap.tire_data
                 if tire and tire.get("compound") == "UNKNOWN":
-                    weather = lap.get("weather_data") or {}
+                    weather = lap.weather_data or {}
                     description = (weather.get("weather") or weather.get("condition") or "").lower()
                     if "rain" in description:
                         tire["compound"] = "INTERMEDIATE"
@@ -443,50 +810,112 @@ class BaseScraper:
         }
         return session_key, final_session_result
 
-    def save_results(self, results: dict):
+    def process_sessions(self, sessions: list):
         """
-        Save the processed session results to a JSON file.
+        Process several sessions, up to max_workers of them at the same time.
+        Results are yielded in completion order so the caller can save them as they arrive.
 
         Args:
-            results (dict): The final session results to be saved.
+            sessions (list): Raw session dictionaries to process.
+        Yields:
+            Tuples of (session, session key, processed session result).
         """
-        output_dir = os.path.join("data", "scraped_data")
-        os.makedirs(output_dir, exist_ok=True)
-        output_filename = os.path.join(output_dir, f"{self.output_prefix}_{self.year}.json")
-        try:
-            with open(output_filename, "w", encoding="utf-8") as outfile:
-                json.dump(results, outfile, indent=4)
-            print("Data successfully saved to", output_filename)
-        except Exception as e:
-            print("Error writing JSON file:", e)
+        if self.max_workers == 1:
+            for session in sessions:
+                s_key, result = self.process_session(session)
+                if self.progress is not None:
+                    self.progress.session_done()
+                yield session, s_key, result
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.process_session, session): session for session in sessions}
+            for future in as_completed(futures):
+                s_key, result = future.result()
+                if self.progress is not None:
+                    self.progress.session_done()
+                yield futures[future], s_key, result
+
+    def save_session(self, checkpoint: SessionCheckpoint, session: dict, result: dict, complete: bool):
+        """
+        Record a processed session in the driver registry and save both the registry and the session.
+        The registry is written first, so it always covers every checkpointed session.
+
+        Args:
+            checkpoint (SessionCheckpoint): Checkpoint of the season.
+            session (dict): Raw session data.
+            result (dict): Processed session result.
+            complete (bool): Whether every driver of the session has a fastest lap.
+        """
+        self.driver_registry.record_result(session.get("session_key"), session.get("date_start"), result)
+        self.driver_registry.save()
+        checkpoint.save_session(session.get("session_key"), result, complete)
+
+    def backfill_teams(self, checkpoint: SessionCheckpoint):
+        """
+        Move drivers saved under UNKNOWN_TEAM into their team, taken from the session nearest in
+        time in which the driver registry saw them. Runs once the whole season has been processed,
+        so sessions scraped before a driver's team was known are fixed without extra requests.
+
+        Args:
+            checkpoint (SessionCheckpoint): Checkpoint of the season.
+        """
+        registry = self.driver_registry
+        if not registry.pending:
+            return
+        manifest = checkpoint.load_manifest()
+        filled = 0
+        for key in list(registry.pending):
+            if key not in manifest:
+                del registry.pending[key]
+                continue
+            result = checkpoint.load_session(key, manifest)
+            if registry.backfill(key, result):
+                checkpoint.save_session(key, result, manifest[key]["complete"])
+                filled += 1
+            if UNKNOWN_TEAM not in result.get("teams", {}):
+                del registry.pending[key]
+        registry.save()
+        if filled:
+            print(f"Filled in missing team names in {filled} session(s) from the driver registry.")
+        if registry.pending:
+            print(f"WARNING: {len(registry.pending)} session(s) still have drivers without a team.")
 
     def run(self):
         """
         Main execution method:
-            1. Load existing results if available.
+            1. Load the checkpoint manifest (migrating an existing results file if needed).
             2. Fetch sessions and determine which need scraping or re-scraping.
-            3. Process each session and handle incomplete sessions with retries.
-            4. Save final aggregated results.
+            3. Process each session, checkpoint it, and retry incomplete sessions as the retry policy allows.
+            4. Back-fill missing team names from the season's driver registry.
+            5. Export the checkpointed sessions into the final aggregated results file.
         """
         output_dir = os.path.join("data", "scraped_data")
         os.makedirs(output_dir, exist_ok=True)
         output_filename = os.path.join(output_dir, f"{self.output_prefix}_{self.year}.json")
+        checkpoint = SessionCheckpoint(os.path.join(output_dir, f"{self.output_prefix}_{self.year}"))
 
-        # Load existing results if available.
-        final_results = {}
-        if os.path.exists(output_filename):
+        # Load the checkpoint manifest; seed it once from an existing results file.
+        manifest = checkpoint.load_manifest()
+        if not manifest and os.path.exists(output_filename):
             try:
                 with open(output_filename, "r", encoding="utf-8") as f:
-                    final_results = json.load(f)
+                    checkpoint.import_results(json.load(f), self.is_session_complete)
+                manifest = checkpoint.load_manifest()
                 print("Loaded existing results from", output_filename)
             except Exception as e:
                 print("Could not load existing file; starting fresh:", e)
-                final_results = {}
+        elif manifest:
+            print("Loaded checkpoint manifest from", checkpoint.manifest_path)
+        self.driver_registry = DriverRegistry(os.path.join(checkpoint.directory, DriverRegistry.FILENAME))
+        registry_loaded = self.driver_registry.load()
 
         sessions = self.fetch_sessions()
         if not sessions:
             print("No sessions found for the provided year.")
+            if self.cache is not None:
+                self.cache.flush()
             return
+        self.mark_historical_sessions(sessions)
 
         # Map sessions by session_key.
         sessions_map = {}
@@ -495,72 +924,66 @@ class BaseScraper:
             if key is not None:
                 sessions_map[str(key)] = session
 
+        if manifest and not registry_loaded:
+            # Checkpoint written before the driver registry existed: build it from the stored sessions.
+            for key, result in checkpoint.iter_sessions():
+                self.driver_registry.record_result(key, sessions_map.get(key, {}).get("date_start"), result)
+            self.driver_registry.save()
+
         # Identify session keys that need scraping or re-scraping.
         missing_session_keys = []
         for key in sessions_map:
-            if key not in final_results:
+            if key not in manifest or not manifest[key]["complete"]:
                 missing_session_keys.append(key)
-            else:
-                if not self.is_session_complete(final_results[key]):
-                    missing_session_keys.append(key)
 
         print("Total sessions from API:", len(sessions_map))
         print("Session keys to (re)scrape:", missing_session_keys)
 
         incomplete_sessions = []
-        for key in missing_session_keys:
-            session = sessions_map[key]
-            s_key, result = self.process_session(session)
-            if self.is_session_complete(result):
-                final_results[s_key] = result
+        pending = [sessions_map[key] for key in missing_session_keys]
+        if self.progress is not None:
+            self.progress.add_planned(len(pending))
+        for session, s_key, result in self.process_sessions(pending):
+            complete = self.is_session_complete(result)
+            self.save_session(checkpoint, session, result, complete)
+            if complete:
                 print(f"Session {s_key} scraped successfully and is complete.")
             else:
-                final_results[s_key] = result
                 incomplete_sessions.append(session)
                 print(f"Session {s_key} scraped but remains incomplete.")
-            self.save_results(final_results)
-            time.sleep(DELAY)
-
-        # Retry incomplete sessions a limited number of times.
-        max_attempts = 2
-        attempt_counter = 0
-        while incomplete_sessions and attempt_counter < max_attempts:
-            print(f"\nRetry attempt {attempt_counter + 1} for {len(incomplete_sessions)} incomplete session(s).")
+
+        # Retry incomplete sessions as often as the retry policy allows.
+        attempt = 0
+        while incomplete_sessions and self.retry_policy.should_retry(attempt):
+            wait_time = self.retry_policy.delay_for(attempt)
+            if wait_time > 0:
+                print(f"\nWaiting {wait_time:g} seconds before retrying {len(incomplete_sessions)} incomplete session(s).")
+                time.sleep(wait_time)
+            print(f"\nRetry attempt {attempt + 1} for {len(incomplete_sessions)} incomplete session(s).")
             still_incomplete = []
-            for session in incomplete_sessions:
-                s_key, result = self.process_session(session)
+            self.invalidate_sessions(incomplete_sessions)
+            if self.progress is not None:
+                self.progress.add_planned(len(incomplete_sessions))
+            for session, s_key, result in self.process_sessions(incomplete_sessions):
                 if self.is_session_complete(result):
-                    final_results[s_key] = result
+                    self.save_session(checkpoint, session, result, True)
                     print(f"Session {s_key} is now complete on retry.")
                 else:
                     still_incomplete.append(session)
-                time.sleep(DELAY)
             incomplete_sessions = still_incomplete
-            attempt_counter += 1
-            self.save_results(final_results)
-
-        # Additional retry loop if the user wants to continue trying.
-        while incomplete_sessions:
-            user_input = input(f"\nThere are {len(incomplete_sessions)} sessions still incomplete after {max_attempts} attempts. "
-                               "Do you want to try another 10 attempts? (y/n): ").strip().lower()
-            if user_input != "y":
-                break
-            attempt_counter = 0
-            while incomplete_sessions and attempt_counter < max_attempts:
-                print(f"\nAdditional attempt round {attempt_counter + 1} for {len(incomplete_sessions)} incomplete session(s).")
-                still_incomplete = []
-                for session in incomplete_sessions:
-                    s_key, result = self.process_session(session)
-                    if self.is_session_complete(result):
-                        final_results[s_key] = result
-                        print(f"Session {s_key} is now complete on additional retry.")
-                    else:
-                        still_incomplete.append(session)
-                    time.sleep(DELAY)
-                incomplete_sessions = still_incomplete
-                attempt_counter += 1
-                self.save_results(final_results)
-
-        # Save final results.
-        self.save_results(final_results)
+            attempt += 1
+        if incomplete_sessions:
+            print(f"\n{len(incomplete_sessions)} session(s) still incomplete after {attempt} retry attempt(s).")
+
+        self.backfill_teams(checkpoint)
+
+        # Export the checkpointed sessions into the final results file.
+        try:
+            # Sessions in API order, as they are listed by the sessions endpoint.
+            checkpoint.export(output_filename, order=sessions_map)
+            print("Data successfully saved to", output_filename)
+        except Exception as e:
+            print("Error writing JSON file:", e)
+        if self.cache is not None:
+            self.cache.flush()
         print("Final results have been saved.")
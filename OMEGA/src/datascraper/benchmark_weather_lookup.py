@@ -0,0 +1,86 @@
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from base_scraper import BaseScraper
+
+RACES = 24
+LAPS_PER_RACE = 1300
+WEATHER_PER_RACE = 150
+
+
+def linear_closest_weather(lap_datetime, weather_list):
+    """
+    Previous implementation of BaseScraper.get_closest_weather: a full scan of the weather list per lap.
+    Kept here as the baseline for the benchmark and for checking that both lookups agree.
+    """
+    best_record = None
+    best_diff = float("inf")
+    for record in weather_list:
+        parsed = record.get("parsed_date")
+        if parsed is None:
+            continue
+        diff = abs((lap_datetime - parsed).total_seconds())
+        if diff < best_diff:
+            best_diff = diff
+            best_record = record
+        elif diff == best_diff:
+            if record["parsed_date"] <= lap_datetime and best_record["parsed_date"] > lap_datetime:
+                best_record = record
+    if best_record is not None:
+        sanitized = best_record.copy()
+        sanitized.pop("parsed_date", None)
+        return sanitized
+    return None
+
+
+def build_season(seed=42):
+    """
+    Build a synthetic season of RACES races, each with lap start times and weather samples.
+    Weather samples arrive roughly once a minute, unsorted and with occasional duplicate timestamps.
+
+    Returns:
+        A list of (lap datetimes, weather records) tuples, one per race.
+    """
+    rnd = random.Random(seed)
+    season = []
+    for race in range(RACES):
+        start = datetime(2024, 3, 1, 15, tzinfo=timezone.utc) + timedelta(days=14 * race)
+        laps = [start + timedelta(seconds=rnd.uniform(0, 2 * 3600)) for _ in range(LAPS_PER_RACE)]
+        weather = []
+        for sample in range(WEATHER_PER_RACE):
+            date = start + timedelta(seconds=60 * sample + rnd.choice([0, 0, 30]))
+            weather.append({"date": date.isoformat(), "air_temperature": rnd.uniform(15, 35),
+                            "rainfall": rnd.choice([0, 1]), "parsed_date": date})
+        weather.extend(dict(record) for record in rnd.sample(weather, 5))
+        rnd.shuffle(weather)
+        season.append((laps, weather))
+    return season
+
+
+def main():
+    scraper = BaseScraper("2024", use_cache=False)
+    season = build_season()
+    lookups = RACES * LAPS_PER_RACE
+    print(f"Synthetic season: {RACES} races x {LAPS_PER_RACE} laps x ~{WEATHER_PER_RACE} weather samples")
+
+    start = time.perf_counter()
+    linear_results = [linear_closest_weather(lap, weather) for laps, weather in season for lap in laps]
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed_results = []
+    for laps, weather in season:
+        weather_index = scraper.build_weather_index(weather)
+        indexed_results.extend(scraper.get_closest_weather(lap, weather_index) for lap in laps)
+    indexed_time = time.perf_counter() - start
+
+    if linear_results != indexed_results:
+        raise SystemExit("Mismatch between linear scan and indexed lookup!")
+    print(f"Linear scan:    {linear_time:.3f} s ({linear_time / lookups * 1e6:.1f} us/lap)")
+    print(f"Sorted + bisect: {indexed_time:.3f} s ({indexed_time / lookups * 1e6:.1f} us/lap)")
+    print(f"Speedup: {linear_time / indexed_time:.1f}x, results identical for {lookups} laps")
+
+
+if __name__ == "__main__":
+    main()
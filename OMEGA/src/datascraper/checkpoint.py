@@ -0,0 +1,175 @@
+import json
+import os
+
+
+def _to_json(value):
+    """
+    json.dump fallback for objects that know their JSON form (e.g. the scraper's Lap records).
+    """
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return to_dict()
+
+
+class SessionCheckpoint:
+    """
+    Append-friendly checkpoint store for scraped sessions.
+
+    Every session is written to its own JSON file with an atomic rename, and a JSON-lines manifest
+    records one line per saved session (the last line for a key wins). Saving a session therefore
+    costs the same no matter how many sessions were scraped before, and a crash loses at most the
+    session that was being written.
+
+    Layout:
+        <directory>/manifest.jsonl        {"session_key": "...", "complete": true, "file": "..."} per line
+        <directory>/sessions/<key>.json   processed session result
+
+    Attributes:
+        directory (str): Directory holding the manifest and the session files.
+    """
+
+    MANIFEST_NAME = "manifest.jsonl"
+
+    def __init__(self, directory: str):
+        """
+        Initialize the checkpoint store, creating its directories if needed.
+
+        Args:
+            directory (str): Directory holding the manifest and the session files.
+        """
+        self.directory = directory
+        self.sessions_dir = os.path.join(directory, "sessions")
+        self.manifest_path = os.path.join(directory, self.MANIFEST_NAME)
+        os.makedirs(self.sessions_dir, exist_ok=True)
+
+    @staticmethod
+    def is_checkpoint(directory: str) -> bool:
+        """
+        Check whether a directory contains a checkpoint manifest.
+        """
+        return os.path.isfile(os.path.join(directory, SessionCheckpoint.MANIFEST_NAME))
+
+    def load_manifest(self) -> dict:
+        """
+        Read the manifest. A torn last line (crash while appending) is ignored.
+        If the manifest has grown much larger than the number of sessions it is compacted.
+
+        Returns:
+            A dictionary mapping session key to {"complete": bool, "file": str}, in first-saved order.
+        """
+        manifest = {}
+        lines = 0
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    lines += 1
+                    manifest[entry["session_key"]] = {"complete": entry["complete"], "file": entry["file"]}
+        except FileNotFoundError:
+            return {}
+        if lines > 2 * len(manifest):
+            self._rewrite_manifest(manifest)
+        return manifest
+
+    def _rewrite_manifest(self, manifest: dict):
+        """
+        Atomically replace the manifest with one line per session.
+        """
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, entry in manifest.items():
+                f.write(json.dumps({"session_key": key, **entry}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    def save_session(self, session_key, result: dict, complete: bool):
+        """
+        Write one session result atomically and record it in the manifest.
+
+        Args:
+            session_key: Key of the scraped session.
+            result (dict): Processed session result.
+            complete (bool): Whether every driver of the session has a fastest lap.
+        """
+        session_key = str(session_key)
+        filename = f"{session_key}.json"
+        path = os.path.join(self.sessions_dir, filename)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # json.dumps encodes in C; json.dump would stream through the pure-Python encoder.
+            f.write(json.dumps(result, default=_to_json))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"session_key": session_key, "complete": complete, "file": filename}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load_session(self, session_key, manifest=None) -> dict:
+        """
+        Load a single session result.
+
+        Args:
+            session_key: Key of the session to load.
+            manifest (dict): Already loaded manifest, to avoid reading it again.
+        Returns:
+            The processed session result.
+        """
+        manifest = manifest if manifest is not None else self.load_manifest()
+        with open(os.path.join(self.sessions_dir, manifest[str(session_key)]["file"]), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def iter_sessions(self, order=None):
+        """
+        Yield (session key, session result) pairs one at a time, in manifest order.
+        Only one session is held in memory at any point.
+
+        Args:
+            order (iterable): Session keys to yield first, in this order; the remaining sessions
+                follow in manifest order.
+        """
+        manifest = self.load_manifest()
+        keys = [key for key in dict.fromkeys(str(key) for key in (order or ())) if key in manifest]
+        keys += [key for key in manifest if key not in set(keys)]
+        for key in keys:
+            yield key, self.load_session(key, manifest)
+
+    def import_results(self, results: dict, is_complete):
+        """
+        Seed the checkpoint from a combined season dictionary (the legacy single-file format).
+
+        Args:
+            results (dict): Mapping of session key to session result.
+            is_complete (callable): Function telling whether a session result is complete.
+        """
+        for key, result in results.items():
+            self.save_session(key, result, is_complete(result))
+
+    def export(self, output_filename: str, order=None):
+        """
+        Write all sessions into one combined JSON file, session by session.
+        The output is identical to json.dump(results, f, indent=4) of the whole season dictionary.
+
+        Sessions are checkpointed in the order they finish, which varies between runs; pass the
+        API order of the sessions as `order` to get the same file every time.
+
+        Args:
+            output_filename (str): Path of the combined JSON file.
+            order (iterable): Session keys in output order (see iter_sessions()).
+        """
+        tmp_path = f"{output_filename}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("{")
+            first = True
+            for key, result in self.iter_sessions(order):
+                # Dump a one-item dictionary and strip its braces to get the indented "key": value pair.
+                f.write(("\n" if first else ",\n") + json.dumps({key: result}, indent=4)[2:-2])
+                first = False
+            f.write("\n}" if not first else "}")
+        os.replace(tmp_path, output_filename)
@@ -1,122 +1,373 @@
+import argparse
+import glob
+import hashlib
 import json
 import csv
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-# Define CSV column mappings as tuples of (Column Header, extractor_function).
-# Each extractor function takes (session_key, circuit, team, record) and returns the value for that column.
+from checkpoint import SessionCheckpoint
+from columnar_store import ParquetSessionWriter, parquet_available, parquet_path_for
+
+MERGED_FILENAME = "data_merged.csv"
+BATCH_STATE_FILENAME = ".batch_state.json"  # fingerprints of the inputs converted by the last batch run
+
+# Define CSV column mappings as tuples of (Column Header, scope, field).
+# The scope names where the value comes from: the session key, circuit or team of the record,
+# the driver record itself, or its fastest lap and the lap's tire/weather data.
+# A field of None means the scope value itself is the column value.
 CSV_COLUMNS = [
-    ("Session Code", lambda sess, circuit, team, rec: sess),
-    ("Circuit Short Name", lambda sess, circuit, team, rec: circuit),
-    ("Team", lambda sess, circuit, team, rec: team),
-    ("Driver Number", lambda sess, circuit, team, rec: rec.get("driver_number", "")),
-    ("Driver Name", lambda sess, circuit, team, rec: rec.get("name", "")),
-    (
-        "Fastest Lap Duration",
-        lambda sess, circuit, team, rec: (rec.get("fastest_lap") or {}).get("lap_duration", ""),
-    ),
-    (
-        "st_speed",
-        lambda sess, circuit, team, rec: (rec.get("fastest_lap") or {}).get("st_speed", ""),
-    ),
-    (
-        "Duration Sector 1",
-        lambda sess, circuit, team, rec: (rec.get("fastest_lap") or {}).get("duration_sector_1", ""),
-    ),
-    (
-        "Duration Sector 2",
-        lambda sess, circuit, team, rec: (rec.get("fastest_lap") or {}).get("duration_sector_2", ""),
-    ),
-    (
-        "Duration Sector 3",
-        lambda sess, circuit, team, rec: (rec.get("fastest_lap") or {}).get("duration_sector_3", ""),
-    ),
-    (
-        "Compound",
-        lambda sess, circuit, team, rec: (rec.get("fastest_lap") or {}).get("tire_data", {}).get("compound", ""),
-    ),
-    (
-        "Tyre Age",
-        lambda sess, circuit, team, rec: (rec.get("fastest_lap") or {}).get("tire_data", {}).get("tyre_age", ""),
-    ),
-    (
-        "Air Temperature",
-        lambda sess, circuit, team, rec: (rec.get("fastest_lap") or {}).get("weather_data", {}).get("air_temperature",
-                                                                                                    ""),
-    ),
-    (
-        "Rainfall",
-        lambda sess, circuit, team, rec: (rec.get("fastest_lap") or {}).get("weather_data", {}).get("rainfall", ""),
-    ),
-    (
-        "Track Temp",
-        lambda sess, circuit, team, rec: (rec.get("fastest_lap") or {}).get("weather_data", {}).get("track_temp", ""),
-    ),
-    (
-        "Wind Direction",
-        lambda sess, circuit, team, rec: (rec.get("fastest_lap") or {}).get("weather_data", {}).get("wind_direction",
-                                                                                                    ""),
-    ),
-    (
-        "Wind Speed",
-        lambda sess, circuit, team, rec: (rec.get("fastest_lap") or {}).get("weather_data", {}).get("wind_speed", ""),
-    )
+    ("Session Code", "session", None),
+    ("Circuit Short Name", "circuit", None),
+    ("Team", "team", None),
+    ("Driver Number", "record", "driver_number"),
+    ("Driver Name", "record", "name"),
+    ("Fastest Lap Duration", "fastest_lap", "lap_duration"),
+    ("st_speed", "fastest_lap", "st_speed"),
+    ("Duration Sector 1", "fastest_lap", "duration_sector_1"),
+    ("Duration Sector 2", "fastest_lap", "duration_sector_2"),
+    ("Duration Sector 3", "fastest_lap", "duration_sector_3"),
+    ("Compound", "tire_data", "compound"),
+    ("Tyre Age", "tire_data", "tyre_age"),
+    ("Air Temperature", "weather_data", "air_temperature"),
+    ("Rainfall", "weather_data", "rainfall"),
+    ("Track Temp", "weather_data", "track_temp"),
+    ("Wind Direction", "weather_data", "wind_direction"),
+    ("Wind Speed", "weather_data", "wind_speed"),
 ]
 
+SCOPES = ("session", "circuit", "team", "record", "fastest_lap", "tire_data", "weather_data")
+
 
-def convert_json_to_csv(json_file_path, csv_file_path):
+def compile_row_extractor(columns=CSV_COLUMNS):
     """
-    Convert JSON scraped data to a CSV file using the defined CSV_COLUMNS mapping.
+    Compile the column mapping into a single extractor function.
+
+    The returned function resolves the fastest lap and its tire/weather data once per record
+    and then reads every column from the already resolved dictionaries.
 
     Args:
-        json_file_path (str): Path to the input JSON file.
-        csv_file_path (str): Path where the output CSV file will be written.
+        columns (list): Column mapping in the CSV_COLUMNS format.
+    Returns:
+        A function (session_key, circuit, team, record) -> list of column values.
+    """
+    plan = [(SCOPES.index(scope), field) for _, scope, field in columns]
+
+    def extract(session_key, circuit, team, rec):
+        fastest_lap = rec.get("fastest_lap") or {}
+        scopes = (session_key, circuit, team, rec, fastest_lap,
+                  fastest_lap.get("tire_data") or {}, fastest_lap.get("weather_data") or {})
+        return [scopes[index] if field is None else scopes[index].get(field, "")
+                for index, field in plan]
+
+    return extract
+
+
+def iter_sessions(input_path):
     """
-    # Read the JSON data.
-    with open(json_file_path, "r", encoding="utf-8") as infile:
+    Yield (session key, session data) pairs from scraped data.
+
+    Args:
+        input_path (str): A scraped JSON file, a per-session checkpoint directory written by the
+            scraper, or an archive directory containing several checkpoints (e.g. one per season).
+            Checkpoints are read one session at a time.
+    """
+    if os.path.isdir(input_path):
+        if SessionCheckpoint.is_checkpoint(input_path):
+            yield from SessionCheckpoint(input_path).iter_sessions()
+            return
+        for name in sorted(os.listdir(input_path)):
+            path = os.path.join(input_path, name)
+            if SessionCheckpoint.is_checkpoint(path):
+                yield from SessionCheckpoint(path).iter_sessions()
+        return
+    with open(input_path, "r", encoding="utf-8") as infile:
         data = json.load(infile)
+    yield from data.items()
+
 
-    rows = []
-    # Iterate through each session and extract CSV rows.
-    for session_key, session_data in data.items():
+def iter_session_rows(input_path, columns=CSV_COLUMNS):
+    """
+    Yield (session key, rows) pairs with the CSV rows of every driver record, one session at a time.
+
+    Args:
+        input_path (str): Scraped JSON file or checkpoint directory.
+        columns (list): Column mapping in the CSV_COLUMNS format.
+    """
+    extract = compile_row_extractor(columns)
+    for session_key, session_data in iter_sessions(input_path):
         circuit = session_data.get("circuit_short_name", "UNKNOWN")
         teams_dict = session_data.get("teams", {})
-        for team, driver_records in teams_dict.items():
-            for rec in driver_records:
-                # Build a row by applying each extractor function.
-                row = [extractor(session_key, circuit, team, rec)
-                       for header, extractor in CSV_COLUMNS]
-                rows.append(row)
-
-    # Write the rows to a CSV file.
-    with open(csv_file_path, "w", newline="", encoding="utf-8") as outfile:
-        writer = csv.writer(outfile)
-        # Write CSV header.
-        writer.writerow([header for header, _ in CSV_COLUMNS])
-        writer.writerows(rows)
+        yield session_key, [extract(session_key, circuit, team, rec)
+                            for team, driver_records in teams_dict.items()
+                            for rec in driver_records]
+
+
+def iter_rows(input_path, columns=CSV_COLUMNS):
+    """
+    Yield CSV rows for every driver record of the scraped data, one at a time.
+
+    Args:
+        input_path (str): Scraped JSON file or checkpoint directory.
+        columns (list): Column mapping in the CSV_COLUMNS format.
+    """
+    for _, rows in iter_session_rows(input_path, columns):
+        yield from rows
+
+
+def convert_json_to_csv(json_file_path, csv_file_path, parquet_file_path=None, keep_rows=False):
+    """
+    Convert scraped data to a CSV file using the defined CSV_COLUMNS mapping.
+    Rows are written session by session; with a checkpoint directory as input only one
+    session is held in memory at a time (unless keep_rows is set).
+
+    Args:
+        json_file_path (str): Path to the input JSON file or per-session checkpoint directory.
+        csv_file_path (str): Path where the output CSV file will be written.
+        parquet_file_path (str): If given, the same rows are also written to this Parquet file
+            with typed columns and row groups made of whole sessions (requires pyarrow).
+        keep_rows (bool): Collect and return the written rows.
+    Returns:
+        The written rows if keep_rows is set, else None.
+    """
+    kept_rows = [] if keep_rows else None
+    headers = [header for header, _, _ in CSV_COLUMNS]
+    parquet_writer = ParquetSessionWriter(parquet_file_path, headers) if parquet_file_path else None
+    try:
+        with open(csv_file_path, "w", newline="", encoding="utf-8") as outfile:
+            writer = csv.writer(outfile)
+            # Write CSV header.
+            writer.writerow(headers)
+            for _, rows in iter_session_rows(json_file_path):
+                writer.writerows(rows)
+                if keep_rows:
+                    kept_rows.extend(rows)
+                if parquet_writer:
+                    parquet_writer.write_session(rows)
+    except BaseException:
+        if parquet_writer:
+            parquet_writer.abort()
+        raise
+    if parquet_writer:
+        parquet_writer.close()
+        print(f"Parquet file successfully written to: {parquet_file_path}")
 
     print(f"CSV file successfully written to: {csv_file_path}")
+    return kept_rows
+
+
+def cleaned_csv_path(input_path, output_dir):
+    """
+    Return the cleaned CSV path for a scraped input (e.g. quali_laps_2024.json -> quali_laps_2024_cleaned.csv).
+    """
+    base_name = os.path.splitext(os.path.basename(os.path.normpath(input_path)))[0]
+    return os.path.join(output_dir, f"{base_name}_cleaned.csv")
 
 
-def main():
+def file_fingerprint(input_path, with_hash=True):
     """
-    Main function to prompt for a JSON file path and convert it to a cleaned CSV file.
+    Describe the current state of a scraped input so unchanged inputs can be skipped.
+    For a checkpoint directory the manifest is fingerprinted.
+
+    Args:
+        input_path (str): Scraped JSON file or checkpoint directory.
+        with_hash (bool): Also compute the SHA-256 of the file contents.
+    Returns:
+        A dictionary with "mtime", "size" and (optionally) "sha256".
+    """
+    if os.path.isdir(input_path):
+        input_path = os.path.join(input_path, SessionCheckpoint.MANIFEST_NAME)
+    stat = os.stat(input_path)
+    fingerprint = {"mtime": stat.st_mtime, "size": stat.st_size}
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(input_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        fingerprint["sha256"] = digest.hexdigest()
+    return fingerprint
+
+
+def _convert_worker(paths):
+    """
+    Process pool entry point: convert one scraped input into its cleaned CSV (and Parquet file).
+    Returns the input path and the written rows, which go into the merged CSV.
+    """
+    input_path, output_path, parquet_output_path = paths
+    return input_path, convert_json_to_csv(input_path, output_path, parquet_output_path, keep_rows=True)
+
+
+def merge_csv_files(csv_paths, merged_path, rows_by_path=None):
+    """
+    Concatenate cleaned CSV files into one merged CSV, streaming row by row.
+    Like data_merged.csv, the merged file starts with an unnamed running index column.
+
+    Args:
+        csv_paths (list): Cleaned CSV files to merge, in output order.
+        merged_path (str): Path of the merged CSV file.
+        rows_by_path (dict): Rows of CSV files that were just written, by CSV path; these files
+            are not read back.
+    """
+    rows_by_path = rows_by_path or {}
+    with open(merged_path, "w", newline="", encoding="utf-8") as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow([""] + [header for header, _, _ in CSV_COLUMNS])
+        index = 0
+        for csv_path in csv_paths:
+            if csv_path in rows_by_path:
+                for row in rows_by_path[csv_path]:
+                    writer.writerow([index] + row)
+                    index += 1
+                continue
+            with open(csv_path, "r", newline="", encoding="utf-8") as infile:
+                reader = csv.reader(infile)
+                next(reader, None)
+                for row in reader:
+                    writer.writerow([index] + row)
+                    index += 1
+    print(f"Merged CSV file successfully written to: {merged_path}")
+
+
+def batch_convert(patterns, output_dir=os.path.join("data", "cleaned_data"), merged_path=None,
+                  workers=None, force=False, parquet=False):
+    """
+    Convert many scraped inputs to cleaned CSVs in a process pool and write a merged CSV.
+
+    Inputs whose modification time and size (or, failing that, content hash) are unchanged since
+    the last batch run are skipped. The merged CSV is rebuilt only if something changed, from the
+    rows returned by the workers and the cleaned CSVs of the skipped inputs.
+
+    Inputs that would write the same cleaned CSV (a season's checkpoint directory and its exported
+    JSON file) are converted once, preferring the checkpoint directory.
+
+    Args:
+        patterns (list): Glob patterns such as "data/scraped_data/race_laps_*.json".
+        output_dir (str): Directory for the cleaned CSVs and the batch state file.
+        merged_path (str): Path of the merged CSV (defaults to data_merged.csv in output_dir).
+        workers (int): Number of worker processes (defaults to the number of CPUs).
+        force (bool): Convert every input even if it is unchanged.
+        parquet (bool): Also write a Parquet file next to every cleaned CSV (requires pyarrow).
+    Returns:
+        The list of inputs that were converted.
+    """
+    input_paths = sorted({path for pattern in patterns for path in glob.glob(pattern)})
+    if not input_paths:
+        print("No input files matched:", ", ".join(patterns))
+        return []
+    by_output = {}
+    for input_path in input_paths:
+        output_path = cleaned_csv_path(input_path, output_dir)
+        other = by_output.get(output_path)
+        if other is not None and not (os.path.isdir(input_path) and not os.path.isdir(other)):
+            print(f"Skipping {input_path}: {other} writes the same output")
+            continue
+        if other is not None:
+            print(f"Skipping {other}: {input_path} writes the same output")
+        by_output[output_path] = input_path
+    input_paths = sorted(by_output.values())
+    if parquet and not parquet_available():
+        print("pyarrow is not installed; writing CSV files only.")
+        parquet = False
+    os.makedirs(output_dir, exist_ok=True)
+    merged_path = merged_path or os.path.join(output_dir, MERGED_FILENAME)
+    state_path = os.path.join(output_dir, BATCH_STATE_FILENAME)
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    files_state = state.get("files", {})
+
+    jobs = []
+    new_files_state = {}
+    for input_path in input_paths:
+        key = os.path.abspath(input_path)
+        output_path = cleaned_csv_path(input_path, output_dir)
+        parquet_output_path = parquet_path_for(output_path) if parquet else None
+        previous = files_state.get(key)
+        current = file_fingerprint(input_path, with_hash=False)
+        unchanged = False
+        outputs_exist = os.path.exists(output_path) and (not parquet or os.path.exists(parquet_output_path))
+        if previous and not force and outputs_exist:
+            if previous["mtime"] == current["mtime"] and previous["size"] == current["size"]:
+                unchanged = True
+            else:
+                current = file_fingerprint(input_path)
+                unchanged = current["sha256"] == previous.get("sha256")
+        if unchanged:
+            new_files_state[key] = {**previous, "mtime": current["mtime"]}
+            print(f"Skipping unchanged input: {input_path}")
+            continue
+        if "sha256" not in current:
+            current = file_fingerprint(input_path)
+        new_files_state[key] = current
+        jobs.append((input_path, output_path, parquet_output_path))
+
+    rows_by_path = {}
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for input_path, rows in executor.map(_convert_worker, jobs):
+                rows_by_path[cleaned_csv_path(input_path, output_dir)] = rows
+                print(f"Converted: {input_path}")
+
+    csv_paths = [cleaned_csv_path(path, output_dir) for path in input_paths]
+    if jobs or state.get("merged_inputs") != csv_paths or not os.path.exists(merged_path):
+        merge_csv_files(csv_paths, merged_path, rows_by_path)
+    else:
+        print("Merged CSV is up to date:", merged_path)
+
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"files": new_files_state, "merged_inputs": csv_paths}, f, indent=2)
+    os.replace(tmp_path, state_path)
+    return [input_path for input_path, _, _ in jobs]
+
+
+def interactive_main():
+    """
+    Prompt for a JSON file (or checkpoint directory) path and convert it to a cleaned CSV file.
 
     It verifies the existence of the JSON file, creates necessary directories, and calls
     convert_json_to_csv() with the appropriate paths.
     """
-    input_file = input("Enter the input JSON file name (with path if needed): ").strip()
+    input_file = input("Enter the input JSON file name or checkpoint directory (with path if needed): ").strip()
     if not os.path.exists(input_file):
         print(f"Error: The file '{input_file}' does not exist.")
         return
 
     # Determine output CSV filename based on the input file's base name.
-    base_name = os.path.splitext(os.path.basename(input_file))[0]
     output_dir = os.path.join("data", "cleaned_data")
     os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, f"{base_name}_cleaned.csv")
+    output_file = cleaned_csv_path(input_file, output_dir)
     print(f"Output will be written to: {output_file}")
     convert_json_to_csv(input_file, output_file)
 
 
+def main(argv=None):
+    """
+    Main function. Without arguments it prompts for a single input file; with --batch it converts
+    every input matching the given glob patterns and writes the merged CSV without prompting.
+
+    Example:
+        python cleaner_csv.py --batch "data/scraped_data/quali_laps_*.json" "data/scraped_data/race_laps_*.json"
+    """
+    parser = argparse.ArgumentParser(description="Convert scraped F1 lap data to cleaned CSV files.")
+    parser.add_argument("--batch", nargs="+", metavar="PATTERN",
+                        help="glob patterns of scraped JSON files or checkpoint directories to convert")
+    parser.add_argument("--output-dir", default=os.path.join("data", "cleaned_data"),
+                        help="directory for the cleaned CSV files")
+    parser.add_argument("--merged", default=None, help=f"path of the merged CSV (default: {MERGED_FILENAME})")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--force", action="store_true", help="convert inputs even if they are unchanged")
+    parser.add_argument("--parquet", action="store_true",
+                        help="also write a typed Parquet file next to each cleaned CSV (needs pyarrow)")
+    args = parser.parse_args(argv)
+
+    if not args.batch:
+        interactive_main()
+        return
+    batch_convert(args.batch, args.output_dir, args.merged, args.workers, args.force, args.parquet)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,214 @@
+import glob
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional; the CSV pipeline works without pyarrow.
+    pa = None
+    pq = None
+
+# Type of every cleaned-data column in the Parquet files ("str", "int" or "float").
+# Missing values (empty CSV cells) are stored as nulls.
+COLUMN_TYPES = {
+    "Session Code": "int",
+    "Circuit Short Name": "str",
+    "Team": "str",
+    "Driver Number": "int",
+    "Driver Name": "str",
+    "Fastest Lap Duration": "float",
+    "st_speed": "float",
+    "Duration Sector 1": "float",
+    "Duration Sector 2": "float",
+    "Duration Sector 3": "float",
+    "Compound": "str",
+    "Tyre Age": "int",
+    "Air Temperature": "float",
+    "Rainfall": "float",
+    "Track Temp": "float",
+    "Wind Direction": "float",
+    "Wind Speed": "float",
+}
+
+# Minimum number of rows per Parquet row group. Row groups are made of whole sessions and a session
+# has one row per driver (about 20), so every complete session becomes its own row group with exact
+# circuit statistics that filters can prune on; only sessions with fewer drivers share a row group.
+ROW_GROUP_ROWS = 16
+
+# Reader filter arguments and the columns they apply to.
+FILTER_COLUMNS = {
+    "circuit": "Circuit Short Name",
+    "team": "Team",
+    "compound": "Compound",
+}
+
+
+def parquet_available() -> bool:
+    """
+    Check whether pyarrow is installed, i.e. whether Parquet files can be written and read.
+    """
+    return pq is not None
+
+
+def _require_pyarrow():
+    if pq is None:
+        raise ImportError("Parquet support needs pyarrow: pip install pyarrow")
+
+
+def _arrow_type(kind):
+    return {"str": pa.string(), "int": pa.int64(), "float": pa.float64()}[kind]
+
+
+def _coerce(values, kind):
+    """
+    Convert one column of extracted values to its declared type. Empty values, and values of a
+    numeric column that are not numbers (e.g. the scraper's "UNKNOWN" driver number), become None.
+    """
+    convert = {"str": str, "int": lambda value: int(float(value)), "float": float}[kind]
+
+    def coerce(value):
+        if value is None or value == "":
+            return None
+        try:
+            return convert(value)
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+    return [coerce(value) for value in values]
+
+
+class ParquetSessionWriter:
+    """
+    Writes cleaned lap rows to a Parquet file with row groups made of whole sessions.
+
+    Sessions are buffered until a row group reaches row_group_rows, so a session never spans two
+    row groups. A writer that is not closed successfully must be aborted, which deletes the
+    temporary file. Every row group carries min/max statistics, which lets readers filtering on a circuit
+    or team skip row groups that cannot match, and columns that are not requested are never decoded.
+
+    Attributes:
+        path (str): Path of the Parquet file.
+        headers (list): Column headers, in CSV column order.
+    """
+
+    def __init__(self, path, headers, row_group_rows=ROW_GROUP_ROWS):
+        """
+        Open the Parquet file for writing. It is written to a temporary file and moved into place by close().
+
+        Args:
+            path (str): Path of the Parquet file.
+            headers (list): Column headers, in CSV column order.
+            row_group_rows (int): Minimum number of rows per row group.
+        """
+        _require_pyarrow()
+        self.path = path
+        self.headers = headers
+        self.kinds = [COLUMN_TYPES.get(header, "str") for header in headers]
+        self.schema = pa.schema([(header, _arrow_type(kind)) for header, kind in zip(headers, self.kinds)])
+        self.row_group_rows = row_group_rows
+        self._pending = []
+        self._tmp_path = f"{path}.tmp"
+        self._writer = pq.ParquetWriter(self._tmp_path, self.schema, compression="snappy")
+
+    def write_session(self, rows):
+        """
+        Add the rows of one session; a row group is written once enough sessions are buffered.
+
+        Args:
+            rows (list): Rows as produced by cleaner_csv.iter_rows(), in header order.
+        """
+        self._pending.extend(rows)
+        if len(self._pending) >= self.row_group_rows:
+            self._flush()
+
+    def _flush(self):
+        """
+        Write the buffered sessions as one row group.
+        """
+        if not self._pending:
+            return
+        columns = list(zip(*self._pending))
+        arrays = [pa.array(_coerce(values, kind), type=field.type)
+                  for values, kind, field in zip(columns, self.kinds, self.schema)]
+        table = pa.Table.from_arrays(arrays, schema=self.schema)
+        self._writer.write_table(table, row_group_size=len(self._pending))
+        self._pending = []
+
+    def close(self):
+        """
+        Write the remaining sessions, finish the file and move it to its final path.
+        """
+        try:
+            self._flush()
+            self._writer.close()
+            os.replace(self._tmp_path, self.path)
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self):
+        """
+        Discard the file being written.
+        """
+        self._pending = []
+        try:
+            self._writer.close()
+        except Exception:
+            pass
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+
+def parquet_path_for(csv_path):
+    """
+    Return the Parquet file written alongside a cleaned CSV (x_cleaned.csv -> x_cleaned.parquet).
+    """
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def read_laps(path, circuit=None, team=None, compound=None, rainfall=None, columns=None, as_pandas=True):
+    """
+    Read cleaned lap data from Parquet, filtering while reading.
+
+    Filters are pushed down to the Parquet reader: row groups whose statistics rule them out are
+    skipped and only the requested columns (plus the filtered ones) are decoded.
+
+    Args:
+        path (str): A Parquet file, a directory of cleaned Parquet files, or a glob pattern.
+        circuit (str or list): Circuit short name(s) to keep.
+        team (str or list): Team name(s) to keep.
+        compound (str or list): Tire compound(s) to keep, e.g. "SOFT".
+        rainfall (bool): True keeps wet laps (Rainfall > 0), False keeps dry laps (Rainfall == 0).
+        columns (list): Columns to return (default: all).
+        as_pandas (bool): Return a pandas DataFrame instead of a pyarrow Table.
+
+    Returns:
+        The matching laps as a DataFrame (or Table).
+    """
+    _require_pyarrow()
+    if os.path.isdir(path):
+        paths = sorted(glob.glob(os.path.join(path, "*.parquet")))
+    else:
+        paths = sorted(glob.glob(path)) or [path]
+
+    filters = []
+    for argument, value in (("circuit", circuit), ("team", team), ("compound", compound)):
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            filters.append((FILTER_COLUMNS[argument], "in", list(value)))
+        else:
+            filters.append((FILTER_COLUMNS[argument], "=", value))
+    if rainfall is not None:
+        filters.append(("Rainfall", ">", 0) if rainfall else ("Rainfall", "=", 0))
+
+    tables = [pq.read_table(file_path, columns=columns, filters=filters or None) for file_path in paths]
+    if not tables:
+        schema = pa.schema([(header, _arrow_type(kind)) for header, kind in COLUMN_TYPES.items()
+                            if columns is None or header in columns])
+        table = schema.empty_table()
+    else:
+        table = pa.concat_tables(tables)
+    return table.to_pandas() if as_pandas else table
@@ -0,0 +1,64 @@
+import filecmp
+import os
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+import performance_calculator
+
+REPLICATION = 100
+OUTPUT_FILES = ["perforance_metrics.csv", "performance_differences.csv",
+                "performance_speed.csv", "performance_wet.csv"]
+
+
+def replicate_input(input_file, output_file, times):
+    """
+    Write the input CSV `times` over (one header) to build a large benchmark input.
+    """
+    with open(input_file, "r", newline="") as infile:
+        header = infile.readline()
+        body = infile.read()
+    if body and not body.endswith("\n"):
+        body += "\n"
+    with open(output_file, "w", newline="") as outfile:
+        outfile.write(header)
+        for _ in range(times):
+            outfile.write(body)
+
+
+def run_engine(engine, input_file, output_folder):
+    """
+    Run the calculator with the given engine and return the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        performance_calculator.main(input_file, output_folder, engine=engine)
+    return time.perf_counter() - start
+
+
+def main():
+    work_dir = tempfile.mkdtemp(prefix="calculator_benchmark_")
+    try:
+        input_file = os.path.join(work_dir, "performance_metrics_data_x100.csv")
+        replicate_input("performance_metrics_data.csv", input_file, REPLICATION)
+        rows_folder = os.path.join(work_dir, "rows")
+        vectorised_folder = os.path.join(work_dir, "vectorised")
+
+        rows_time = run_engine("rows", input_file, rows_folder)
+        vectorised_time = run_engine("vectorised", input_file, vectorised_folder)
+
+        for name in OUTPUT_FILES:
+            if not filecmp.cmp(os.path.join(rows_folder, name), os.path.join(vectorised_folder, name), shallow=False):
+                raise SystemExit(f"Output mismatch in {name}!")
+        print(f"Input replicated {REPLICATION}x")
+        print(f"Row-by-row engine: {rows_time:.3f} s")
+        print(f"Vectorised engine: {vectorised_time:.3f} s")
+        print(f"Speedup: {rows_time / vectorised_time:.1f}x, all {len(OUTPUT_FILES)} output files byte-identical")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
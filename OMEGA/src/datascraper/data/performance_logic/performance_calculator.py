@@ -1,6 +1,24 @@
+import argparse
+import hashlib
+import io
+import json
 import os
 import csv
 
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # the row-by-row engine only needs the standard library
+    np = None
+    pd = None
+
+STATE_FILENAME = "calculator_state.json"  # running totals and watermark of update_incremental()
+STATE_VERSION = 1
+
+# Names of the per-team running totals kept by accumulate_rows().
+TOTAL_NAMES = ("duration_sums", "duration_counts", "speed_sums", "speed_counts",
+               "wet_speed_sums", "wet_speed_counts")
+
 
 def parse_duration(duration_str):
     """
@@ -39,75 +57,177 @@ def normalize_team(team):
         return team_clean
 
 
-def main():
-    input_file = "performance_metrics_data.csv"
+def accumulate_rows(rows, totals=None):
+    """
+    Fold CSV rows (dictionaries as produced by csv.DictReader) into per-team running totals.
 
-    # Create output folder if it does not exist.
-    output_folder = "performance_metrics"
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
+    Args:
+        rows (iterable): Rows with "Team", "Fastest Lap Duration", "st_speed" and "Rainfall" columns.
+        totals (dict): Totals to continue from; a new set is created if omitted.
+    Returns:
+        A dictionary of six per-team dictionaries: duration/speed/wet_speed sums and counts.
+        Teams keep the order in which they first appeared.
+    """
+    if totals is None:
+        totals = {name: {} for name in TOTAL_NAMES}
+    team_duration_sums = totals["duration_sums"]
+    team_duration_counts = totals["duration_counts"]
+    team_speed_sums = totals["speed_sums"]
+    team_speed_counts = totals["speed_counts"]
+    team_wet_speed_sums = totals["wet_speed_sums"]
+    team_wet_speed_counts = totals["wet_speed_counts"]
 
-    # Initialize accumulators for lap durations.
-    team_duration_sums = {}
-    team_duration_counts = {}
+    for row in rows:
+        # Normalize the team name.
+        team = normalize_team(row["Team"])
 
-    # Initialize accumulators for overall max speed.
-    team_speed_sums = {}
-    team_speed_counts = {}
+        # Process fastest lap duration.
+        duration_str = row["Fastest Lap Duration"].strip()
+        duration = parse_duration(duration_str)
+        team_duration_sums[team] = team_duration_sums.get(team, 0.0) + duration
+        team_duration_counts[team] = team_duration_counts.get(team, 0) + 1
 
-    # Initialize accumulators for wet sessions max speed.
-    team_wet_speed_sums = {}
-    team_wet_speed_counts = {}
+        # Process overall max speed from the "st_speed" column.
+        try:
+            speed = float(row["st_speed"].strip())
+            team_speed_sums[team] = team_speed_sums.get(team, 0.0) + speed
+            team_speed_counts[team] = team_speed_counts.get(team, 0) + 1
+        except ValueError:
+            # Skip rows with invalid speed values.
+            continue
 
-    # Read the CSV file and accumulate data for each (normalized) team.
-    try:
-        with open(input_file, "r", newline="") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                # Normalize the team name.
-                team = normalize_team(row["Team"])
-
-                # Process fastest lap duration.
-                duration_str = row["Fastest Lap Duration"].strip()
-                duration = parse_duration(duration_str)
-                team_duration_sums[team] = team_duration_sums.get(team, 0.0) + duration
-                team_duration_counts[team] = team_duration_counts.get(team, 0) + 1
-
-                # Process overall max speed from the "st_speed" column.
-                try:
-                    speed = float(row["st_speed"].strip())
-                    team_speed_sums[team] = team_speed_sums.get(team, 0.0) + speed
-                    team_speed_counts[team] = team_speed_counts.get(team, 0) + 1
-                except ValueError:
-                    # Skip rows with invalid speed values.
-                    continue
-
-                # Process wet sessions: only include rows where Rainfall equals 1.
-                try:
-                    rainfall_val = float(row["Rainfall"].strip())
-                except ValueError:
-                    rainfall_val = 0.0
-                if rainfall_val == 1.0:
-                    try:
-                        wet_speed = float(row["st_speed"].strip())
-                        team_wet_speed_sums[team] = team_wet_speed_sums.get(team, 0.0) + wet_speed
-                        team_wet_speed_counts[team] = team_wet_speed_counts.get(team, 0) + 1
-                    except ValueError:
-                        continue
-    except FileNotFoundError:
-        print(f"Input file '{input_file}' not found.")
-        return
-    except Exception as e:
-        print("An error occurred while reading the input file:", e)
-        return
+        # Process wet sessions: only include rows where Rainfall equals 1.
+        try:
+            rainfall_val = float(row["Rainfall"].strip())
+        except ValueError:
+            rainfall_val = 0.0
+        if rainfall_val == 1.0:
+            try:
+                wet_speed = float(row["st_speed"].strip())
+                team_wet_speed_sums[team] = team_wet_speed_sums.get(team, 0.0) + wet_speed
+                team_wet_speed_counts[team] = team_wet_speed_counts.get(team, 0) + 1
+            except ValueError:
+                continue
+    return totals
+
+
+def average_totals(totals):
+    """
+    Turn running totals into per-team averages.
+
+    Returns:
+        A tuple of three dictionaries: average lap duration, average max speed and
+        average wet max speed per team.
+    """
+    averages = []
+    for sums_name, counts_name in (("duration_sums", "duration_counts"),
+                                   ("speed_sums", "speed_counts"),
+                                   ("wet_speed_sums", "wet_speed_counts")):
+        sums, counts = totals[sums_name], totals[counts_name]
+        averages.append({team: sums[team] / counts[team] for team in sums if counts[team] > 0})
+    return tuple(averages)
+
+
+def compute_team_averages(input_file):
+    """
+    Compute per-team averages by reading the input CSV row by row.
+
+    Returns:
+        A tuple of three dictionaries (lap duration, max speed, wet max speed averages).
+    """
+    with open(input_file, "r", newline="") as csvfile:
+        totals = accumulate_rows(csv.DictReader(csvfile))
+    return average_totals(totals)
 
-    # --- Lap Duration Analysis ---
-    # Calculate the average fastest lap duration for each team.
-    team_avg_duration = {}
-    for team in team_duration_sums:
-        if team_duration_counts[team] > 0:
-            team_avg_duration[team] = team_duration_sums[team] / team_duration_counts[team]
 
+def _parse_float_column(series):
+    """
+    Convert a CSV column to floats with the same rules as float(value.strip()).
+    Numeric columns (blank cells read as NaN) are used as they are. Text columns are cast value by
+    value with float(), because pandas' own number parser can differ in the last bit.
+
+    Returns:
+        A tuple (values, valid): values is NaN where float() would raise, valid marks parsed values.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=float)
+        return values, ~np.isnan(values)
+    values = series.to_numpy(dtype=object)
+    valid = ~series.isna().to_numpy()
+    parsed = np.full(len(values), np.nan)
+    for index in np.flatnonzero(valid):
+        try:
+            parsed[index] = float(values[index])
+        except ValueError:
+            valid[index] = False
+    return parsed, valid
+
+
+def _grouped_means(values, team_codes, team_names, mask):
+    """
+    Average `values` per team over the rows selected by `mask`, keeping first-appearance order.
+    np.bincount adds the weights one row after another, so the sums match the row-by-row engine exactly.
+    """
+    codes = team_codes[mask]
+    if codes.size == 0:
+        return {}
+    sums = np.bincount(codes, weights=values[mask], minlength=len(team_names))
+    counts = np.bincount(codes, minlength=len(team_names))
+    # Order teams by the first selected row they appear in.
+    present, first_rows = np.unique(codes, return_index=True)
+    ordered = present[np.argsort(first_rows)]
+    return {team_names[code]: sums[code] / counts[code] for code in ordered}
+
+
+def compute_team_averages_vectorised(input_file):
+    """
+    Compute per-team averages with column-wise NumPy/pandas operations.
+    Produces exactly the same numbers and team order as compute_team_averages().
+
+    Returns:
+        A tuple of three dictionaries (lap duration, max speed, wet max speed averages).
+    """
+    # float_precision="round_trip" parses numbers exactly like float(); columns holding anything
+    # that is not a plain number stay as strings and take the slower path below.
+    df = pd.read_csv(input_file, usecols=["Team", "Fastest Lap Duration", "st_speed", "Rainfall"],
+                     dtype={"Team": str}, keep_default_na=False, na_values={"st_speed": [""], "Rainfall": [""]},
+                     float_precision="round_trip")
+
+    # Normalise each distinct team name once, then group rows by the normalised name.
+    raw_codes, raw_teams = pd.factorize(df["Team"], sort=False)
+    normalized = np.array([normalize_team(team) for team in raw_teams], dtype=object)
+    team_codes, team_names = pd.factorize(normalized[raw_codes], sort=False)
+    team_names = list(team_names)
+
+    # Durations: plain seconds are converted column-wise; "m:ss.sss" values go through parse_duration.
+    durations = df["Fastest Lap Duration"]
+    if pd.api.types.is_numeric_dtype(durations):
+        durations = durations.to_numpy(dtype=float)
+    else:
+        durations_str = durations.astype(str).to_numpy(dtype=object)
+        has_colon = np.array([":" in value for value in durations_str], dtype=bool)
+        durations = np.empty(len(df), dtype=float)
+        durations[~has_colon] = durations_str[~has_colon].astype(float)
+        durations[has_colon] = [parse_duration(value) for value in durations_str[has_colon]]
+
+    speeds, valid_speed = _parse_float_column(df["st_speed"])
+    rainfall, _ = _parse_float_column(df["Rainfall"])
+    wet = valid_speed & (rainfall == 1.0)
+
+    all_rows = np.ones(len(df), dtype=bool)
+    return (_grouped_means(durations, team_codes, team_names, all_rows),
+            _grouped_means(speeds, team_codes, team_names, valid_speed),
+            _grouped_means(speeds, team_codes, team_names, wet))
+
+
+def write_metrics(output_folder, team_avg_duration, team_avg_speed, team_avg_wet_speed):
+    """
+    Write the four performance metrics CSV files from per-team averages.
+
+    Returns:
+        True if all files were written, False if the analysis stopped early.
+    """
+    # --- Lap Duration Analysis ---
     # Write performance metrics (lap durations) to perforance_metrics.csv.
     metrics_file_path = os.path.join(output_folder, "perforance_metrics.csv")
     try:
@@ -118,13 +238,13 @@ def main():
                 writer.writerow([team, f"{avg:.3f}"])
     except Exception as e:
         print("An error occurred while writing the performance metrics file:", e)
-        return
+        return False
 
     # Determine the best (minimum) average lap duration.
     best_avg_duration = min(team_avg_duration.values(), default=None)
     if best_avg_duration is None:
         print("No lap duration data available.")
-        return
+        return False
 
     # Calculate the difference from the best for each team.
     duration_differences = {
@@ -141,20 +261,14 @@ def main():
                 writer.writerow([team, f"{diff:.3f}"])
     except Exception as e:
         print("An error occurred while writing the performance differences file:", e)
-        return
+        return False
 
     # --- Overall Speed Analysis ---
-    # Calculate the average max speed for each team.
-    team_avg_speed = {}
-    for team in team_speed_sums:
-        if team_speed_counts[team] > 0:
-            team_avg_speed[team] = team_speed_sums[team] / team_speed_counts[team]
-
     # Determine the best average speed (i.e., highest average max speed).
     best_avg_speed = max(team_avg_speed.values(), default=None)
     if best_avg_speed is None:
         print("No overall max speed data available.")
-        return
+        return False
 
     # Calculate the difference in max speed relative to the best.
     speed_differences = {
@@ -172,15 +286,9 @@ def main():
                                  f"{speed_differences[team]:.3f}"])
     except Exception as e:
         print("An error occurred while writing the performance speed file:", e)
-        return
+        return False
 
     # --- Wet Sessions Speed Analysis ---
-    # Calculate the average max speed for each team in wet conditions (Rainfall == 1).
-    team_avg_wet_speed = {}
-    for team in team_wet_speed_sums:
-        if team_wet_speed_counts[team] > 0:
-            team_avg_wet_speed[team] = team_wet_speed_sums[team] / team_wet_speed_counts[team]
-
     # Determine the best average speed in wet conditions.
     best_avg_wet_speed = max(team_avg_wet_speed.values(), default=None)
     if best_avg_wet_speed is None:
@@ -203,7 +311,43 @@ def main():
                                      f"{wet_speed_differences[team]:.3f}"])
         except Exception as e:
             print("An error occurred while writing the wet performance file:", e)
-            return
+            return False
+    return True
+
+
+def main(input_file="performance_metrics_data.csv", output_folder="performance_metrics", engine=None):
+    """
+    Compute the team performance metrics and write them to the output folder.
+
+    Args:
+        input_file (str): CSV file with one row per driver and session.
+        output_folder (str): Folder receiving the metrics CSV files.
+        engine (str): "vectorised" (NumPy/pandas) or "rows" (csv module). Defaults to the
+            vectorised engine when NumPy and pandas are installed.
+    """
+    if engine is None:
+        engine = "vectorised" if pd is not None else "rows"
+    if engine == "vectorised" and pd is None:
+        print("NumPy/pandas not available; falling back to the row-by-row engine.")
+        engine = "rows"
+    compute = compute_team_averages_vectorised if engine == "vectorised" else compute_team_averages
+
+    # Create output folder if it does not exist.
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+
+    # Read the CSV file and accumulate data for each (normalized) team.
+    try:
+        team_avg_duration, team_avg_speed, team_avg_wet_speed = compute(input_file)
+    except FileNotFoundError:
+        print(f"Input file '{input_file}' not found.")
+        return
+    except Exception as e:
+        print("An error occurred while reading the input file:", e)
+        return
+
+    if not write_metrics(output_folder, team_avg_duration, team_avg_speed, team_avg_wet_speed):
+        return
 
     print(f"Analysis complete! Files saved in the '{output_folder}' folder:")
     print(" - perforance_metrics.csv")
@@ -212,5 +356,134 @@ def main():
     print(" - performance_wet.csv")
 
 
+def _prefix_digest(f, length):
+    """
+    Return a SHA-256 object fed with the first `length` bytes of an open binary file. It can be
+    extended with the bytes that follow, so the file is hashed only once.
+    Hashing is far cheaper than parsing, and detects an input that was rewritten instead of appended to.
+    """
+    digest = hashlib.sha256()
+    f.seek(0)
+    remaining = length
+    while remaining > 0:
+        chunk = f.read(min(remaining, 1024 * 1024))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest
+
+
+def load_state(state_path):
+    """
+    Load the incremental calculator state, or None if there is no usable state file.
+    """
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(state_path, state):
+    """
+    Atomically write the incremental calculator state.
+    """
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+
+def _matching_prefix_digest(state, f):
+    """
+    Check that the input CSV only grew since the state was saved: the file is at least as long as
+    the watermark and everything before the watermark is unchanged.
+
+    Returns:
+        The SHA-256 object of the bytes before the watermark if they match the state, else None.
+    """
+    if not state or state.get("version") != STATE_VERSION:
+        return None
+    if os.fstat(f.fileno()).st_size < state["offset"]:
+        return None
+    digest = _prefix_digest(f, state["offset"])
+    return digest if digest.hexdigest() == state["prefix_digest"] else None
+
+
+def update_incremental(input_file="performance_metrics_data.csv", output_folder="performance_metrics"):
+    """
+    Update the performance metrics by folding in only the rows appended to the input CSV since
+    the previous run. Per-team running sums and counts are persisted in a state file in the output
+    folder together with a byte-offset watermark. Because rows are added in the same order as in a
+    full run, the results are identical to a full recompute.
+
+    If there is no state yet, or the input was rewritten rather than appended to, the whole file
+    is folded in from the start.
+
+    Args:
+        input_file (str): CSV file with one row per driver and session.
+        output_folder (str): Folder receiving the metrics CSV files and the state file.
+    """
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+    state_path = os.path.join(output_folder, STATE_FILENAME)
+
+    try:
+        state = load_state(state_path)
+        with open(input_file, "rb") as f:
+            digest = _matching_prefix_digest(state, f)
+            if digest is None:
+                if state:
+                    print("Input file was rewritten; recomputing metrics from the start.")
+                state = None
+            f.seek(0)
+            header_line = f.readline()
+            if state is None:
+                state = {
+                    "version": STATE_VERSION,
+                    "offset": len(header_line),
+                    "rows": 0,
+                    "totals": {name: {} for name in TOTAL_NAMES},
+                }
+                digest = hashlib.sha256(header_line)
+            f.seek(state["offset"])
+            new_data = f.read()
+            # Only fold in complete lines; a partially appended last line is picked up next time.
+            new_data = new_data[:new_data.rfind(b"\n") + 1]
+            new_offset = state["offset"] + len(new_data)
+            # Extend the verified digest over the new bytes instead of hashing the prefix again.
+            digest.update(new_data)
+            prefix_digest = digest.hexdigest()
+        fieldnames = next(csv.reader([header_line.decode("utf-8")]))
+        new_rows = list(csv.DictReader(io.StringIO(new_data.decode("utf-8"), newline=""), fieldnames=fieldnames))
+        accumulate_rows(new_rows, state["totals"])
+    except FileNotFoundError:
+        print(f"Input file '{input_file}' not found.")
+        return
+    except Exception as e:
+        print("An error occurred while reading the input file:", e)
+        return
+
+    state["offset"] = new_offset
+    state["rows"] += len(new_rows)
+    state["prefix_digest"] = prefix_digest
+
+    if not write_metrics(output_folder, *average_totals(state["totals"])):
+        return
+    save_state(state_path, state)
+    print(f"Folded in {len(new_rows)} new row(s); {state['rows']} row(s) in total.")
+    print(f"Analysis complete! Files saved in the '{output_folder}' folder.")
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Compute team performance metrics.")
+    parser.add_argument("--engine", choices=["vectorised", "rows"], default=None,
+                        help="calculation engine for a full recompute")
+    parser.add_argument("--incremental", action="store_true",
+                        help="fold in only the rows appended since the previous incremental run")
+    args = parser.parse_args()
+    if args.incremental:
+        update_incremental()
+    else:
+        main(engine=args.engine)
@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+UNKNOWN_TEAM = "UNKNOWN TEAM"  # team group of drivers whose team is not known
+
+
+def _parse_date(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class DriverRegistry:
+    """
+    Season-level record of which team each driver drove for, built from the drivers responses the
+    scraper fetches anyway while processing sessions.
+
+    Missing team names are looked up in the registry instead of searching for a session with a
+    complete roster, so resolving them costs no extra requests. A driver who changed teams during
+    the season gets the team of the session nearest in time. Sessions that still had drivers
+    without a team when they were processed are remembered as pending and back-filled once the
+    whole season has been seen.
+
+    The registry is stored as JSON next to the checkpoint, so a resumed run knows the drivers of
+    the sessions scraped before.
+
+    Attributes:
+        path (str): JSON file the registry is stored in, or None for an in-memory registry.
+        pending (dict): Session key -> session start date of sessions with drivers in UNKNOWN_TEAM.
+    """
+
+    FILENAME = "drivers.json"
+
+    def __init__(self, path=None):
+        self.path = path
+        self.pending = {}
+        # Driver key -> {session key: [session start date, team name]}.
+        self._teams = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def driver_key(number, name):
+        """
+        Return the key identifying a driver: "num:<number>" if the number is known, else "name:<name>", else None.
+        """
+        if number is not None and str(number).strip() != "":
+            return f"num:{str(number).strip()}"
+        if name is not None and str(name).strip() != "":
+            return f"name:{str(name).strip()}"
+        return None
+
+    def load(self) -> bool:
+        """
+        Load the registry from its file.
+
+        Returns:
+            True if a stored registry was loaded.
+        """
+        if not self.path:
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return False
+        with self._lock:
+            self._teams = stored.get("teams", {})
+            self.pending = stored.get("pending", {})
+        return True
+
+    def save(self):
+        """
+        Atomically write the registry to its file.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            content = json.dumps({"teams": self._teams, "pending": self.pending})
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, self.path)
+
+    def record(self, session_key, date_start, drivers):
+        """
+        Remember the team of every driver of a session whose team is known.
+
+        Args:
+            session_key: Key of the session.
+            date_start (str): ISO start date of the session.
+            drivers (list): Driver dictionaries with "driver_number", "full_name" and "team_name".
+        """
+        with self._lock:
+            for driver in drivers:
+                team = driver.get("team_name")
+                if not (team and team.strip() != "" and team != UNKNOWN_TEAM):
+                    continue
+                number, name = driver.get("driver_number"), driver.get("full_name")
+                for key in (self.driver_key(number, None), self.driver_key(None, name)):
+                    if key:
+                        self._teams.setdefault(key, {})[str(session_key)] = [date_start, team]
+
+    def team_for(self, key, date_start):
+        """
+        Return the team of a driver in the recorded session nearest to date_start, or None if unknown.
+        """
+        with self._lock:
+            sessions = list(self._teams.get(key, {}).values())
+        if not sessions:
+            return None
+        target = _parse_date(date_start)
+
+        def distance(entry):
+            recorded = _parse_date(entry[0])
+            if target is None or recorded is None:
+                return float("inf")
+            return abs((recorded - target).total_seconds())
+
+        return min(sessions, key=distance)[1]
+
+    def lookup(self, number, name, date_start):
+        """
+        Return the team of a driver identified by number or, failing that, by full name, or None.
+        """
+        for key in (self.driver_key(number, None), self.driver_key(None, name)):
+            team = self.team_for(key, date_start) if key else None
+            if team:
+                return team
+        return None
+
+    def fill_missing_teams(self, drivers, date_start):
+        """
+        Set "team_name" of drivers without a team from the registry, where it is known.
+
+        Args:
+            drivers (list): Driver dictionaries, updated in place.
+            date_start (str): ISO start date of their session.
+        """
+        for driver in drivers:
+            team = driver.get("team_name")
+            if team and team.strip() != "":
+                continue
+            team = self.lookup(driver.get("driver_number"), driver.get("full_name"), date_start)
+            if team:
+                driver["team_name"] = team
+
+    def record_result(self, session_key, date_start, result):
+        """
+        Record the teams of a processed session result and remember the session as pending if it
+        has drivers in UNKNOWN_TEAM (or forget it if it no longer has any).
+
+        Args:
+            session_key: Key of the session.
+            date_start (str): ISO start date of the session.
+            result (dict): Processed session result.
+        """
+        teams = (result or {}).get("teams", {})
+        self.record(session_key, date_start, [
+            {"driver_number": None if record.get("driver_number") == "UNKNOWN" else record.get("driver_number"),
+             "full_name": None if record.get("name") == "UNKNOWN DRIVER" else record.get("name"),
+             "team_name": team}
+            for team, records in teams.items() for record in records])
+        with self._lock:
+            if UNKNOWN_TEAM in teams:
+                self.pending[str(session_key)] = date_start
+            else:
+                self.pending.pop(str(session_key), None)
+
+    def backfill(self, session_key, result) -> bool:
+        """
+        Move the driver records of UNKNOWN_TEAM in a processed session into their teams, where the
+        registry knows them.
+
+        Args:
+            session_key: Key of the session (a key of pending).
+            result (dict): Processed session result, updated in place.
+        Returns:
+            True if any driver record was moved.
+        """
+        teams = result.get("teams", {})
+        unknown = teams.get(UNKNOWN_TEAM)
+        if not unknown:
+            return False
+        date_start = self.pending.get(str(session_key))
+        remaining = []
+        for record in unknown:
+            number = record.get("driver_number")
+            name = record.get("name")
+            team = self.lookup(None if number == "UNKNOWN" else number,
+                               None if name == "UNKNOWN DRIVER" else name, date_start)
+            if team:
+                teams.setdefault(team, []).append(record)
+            else:
+                remaining.append(record)
+        if len(remaining) == len(unknown):
+            return False
+        if remaining:
+            teams[UNKNOWN_TEAM] = remaining
+        else:
+            del teams[UNKNOWN_TEAM]
+        return True
@@ -0,0 +1,270 @@
+import gzip
+import http.client
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+API_BASE = "https://api.openf1.org"
+DEFAULT_TIMEOUT = 30  # seconds to wait for a connection or a response
+STREAM_CHUNK_BYTES = 64 * 1024  # bytes read from the socket per chunk by HttpTransport.stream()
+USER_AGENT = "OMEGA-scraper"
+
+
+class HttpStatusError(Exception):
+    """
+    Raised for a non-2xx HTTP response.
+
+    Attributes:
+        url (str): Requested URL.
+        code (int): HTTP status code.
+        retry_after (float): Seconds the server asked us to wait (Retry-After header), or None.
+    """
+
+    def __init__(self, url, code, reason="", retry_after=None):
+        super().__init__(f"HTTP {code} {reason}".strip())
+        self.url = url
+        self.code = code
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header (delay in seconds or an HTTP date) into seconds, or None.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpTransport:
+    """
+    Thread-safe HTTP client with a pool of persistent (keep-alive) connections per host.
+
+    Connections are reused across requests, so the TCP and TLS handshakes to the API happen once
+    per pooled connection instead of once per request. Responses are requested with gzip
+    compression and decoded transparently.
+
+    For tests the API can be redirected to a local stub server with api_base: every URL starting
+    with API_BASE is sent to api_base instead (e.g. "http://127.0.0.1:8000"). The URL used as the
+    cache key stays unchanged.
+
+    Attributes:
+        pool_size (int): Maximum number of idle connections kept per host.
+        timeout (float): Socket timeout in seconds.
+        api_base (str): Replacement for API_BASE, or None.
+        requests (int): Number of requests sent.
+        connections_opened (int): Number of connections created.
+        bytes_received (int): Response bytes received over the wire (before decompression).
+    """
+
+    def __init__(self, pool_size=4, timeout=DEFAULT_TIMEOUT, api_base=None):
+        """
+        Initialize the transport with empty connection pools.
+
+        Args:
+            pool_size (int): Maximum number of idle connections kept per host.
+            timeout (float): Socket timeout in seconds.
+            api_base (str): Optional base URL replacing API_BASE (stub server for tests).
+        """
+        self.pool_size = max(1, int(pool_size))
+        self.timeout = timeout
+        self.api_base = api_base.rstrip("/") if api_base else None
+        self.requests = 0
+        self.connections_opened = 0
+        self.bytes_received = 0
+        self._idle = {}  # (scheme, host, port) -> list of idle connections
+        self._lock = threading.Lock()
+
+    def resolve(self, url):
+        """
+        Return the URL actually requested for url (after applying api_base).
+        """
+        if self.api_base and url.startswith(API_BASE):
+            return self.api_base + url[len(API_BASE):]
+        return url
+
+    @staticmethod
+    def _target(url):
+        """
+        Split a resolved URL into its pool key and request path.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        return key, path
+
+    def _acquire(self, key):
+        """
+        Take an idle connection for the host, or open a new one. Returns (connection, reused).
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+            self.connections_opened += 1
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(host, port, timeout=self.timeout), False
+
+    def _release(self, key, connection):
+        """
+        Return a connection to its pool, closing it if the pool is full.
+        """
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.pool_size:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _send(self, key, path):
+        """
+        Send a GET request on a pooled connection and return (connection, response) once the
+        response headers have arrived. A reused keep-alive connection the server has closed in the
+        meantime is replaced by a fresh one.
+        """
+        headers = {"Accept-Encoding": "gzip, deflate", "Accept": "application/json", "User-Agent": USER_AGENT}
+        while True:
+            connection, reused = self._acquire(key)
+            try:
+                connection.request("GET", path, headers=headers)
+                return connection, connection.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                connection.close()
+                if reused:
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+
+    def get(self, url):
+        """
+        Send a GET request and return the decoded response body.
+
+        Args:
+            url (str): URL to fetch.
+        Returns:
+            The response body as bytes (decompressed).
+        Raises:
+            HttpStatusError: For non-2xx responses.
+            OSError, http.client.HTTPException: For connection failures.
+        """
+        key, path = self._target(self.resolve(url))
+        connection, response = self._send(key, path)
+        try:
+            raw = response.read()
+        except Exception:
+            connection.close()
+            raise
+
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += len(raw)
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(key, connection)
+
+        if not 200 <= response.status < 300:
+            raise HttpStatusError(url, response.status, response.reason,
+                                  parse_retry_after(response.getheader("Retry-After")))
+
+        encoding = (response.getheader("Content-Encoding") or "").lower()
+        if encoding == "gzip":
+            return gzip.decompress(raw)
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(raw)
+            except zlib.error:
+                return zlib.decompress(raw, -zlib.MAX_WBITS)  # raw deflate stream without zlib header
+        return raw
+
+    def stream(self, url, chunk_size=STREAM_CHUNK_BYTES):
+        """
+        Send a GET request and yield the decoded response body in chunks as it arrives, so the
+        complete body never has to be held in memory.
+
+        The connection goes back to the pool once the body has been read to the end; if the caller
+        stops early, it is closed instead.
+
+        Args:
+            url (str): URL to fetch.
+            chunk_size (int): Number of bytes read from the socket at a time.
+        Yields:
+            Decompressed chunks of the response body (bytes).
+        Raises:
+            HttpStatusError: For non-2xx responses (before the first chunk is yielded).
+            OSError, http.client.HTTPException, zlib.error: For connection or decoding failures.
+        """
+        key, path = self._target(self.resolve(url))
+        connection, response = self._send(key, path)
+        finished = False
+        try:
+            with self._lock:
+                self.requests += 1
+            if not 200 <= response.status < 300:
+                raw = response.read()
+                with self._lock:
+                    self.bytes_received += len(raw)
+                finished = True
+                raise HttpStatusError(url, response.status, response.reason,
+                                      parse_retry_after(response.getheader("Retry-After")))
+
+            encoding = (response.getheader("Content-Encoding") or "").lower()
+            decompressor = None
+            if encoding == "gzip":
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            elif encoding == "deflate":
+                decompressor = zlib.decompressobj()
+            first = True
+            while True:
+                raw = response.read(chunk_size)
+                if not raw:
+                    break
+                with self._lock:
+                    self.bytes_received += len(raw)
+                if decompressor is None:
+                    yield raw
+                    continue
+                try:
+                    chunk = decompressor.decompress(raw)
+                except zlib.error:
+                    if not (first and encoding == "deflate"):
+                        raise
+                    # Raw deflate stream without zlib header.
+                    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                    chunk = decompressor.decompress(raw)
+                first = False
+                if chunk:
+                    yield chunk
+            if decompressor is not None:
+                tail = decompressor.flush()
+                if tail:
+                    yield tail
+            finished = True
+        finally:
+            if finished and not response.will_close:
+                self._release(key, connection)
+            else:
+                connection.close()
+
+    def close(self):
+        """
+        Close every idle connection.
+        """
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for idle in pools.values():
+            for connection in idle:
+                connection.close()
@@ -0,0 +1,91 @@
+import codecs
+import json
+
+WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789+-.eE"
+# Characters between a decode error and the end of the buffer up to which the error may just be a
+# token (number, literal or escape) cut off by a chunk boundary; an error further back is malformed JSON.
+MAX_TRUNCATED_TOKEN = 64
+
+
+def iter_json_array(chunks, object_hook=None):
+    """
+    Parse a JSON array incrementally and yield its elements one at a time.
+
+    Chunks of UTF-8 bytes are decoded as they come in and every complete element is parsed with
+    JSONDecoder.raw_decode() and yielded, so only the element being parsed and the unparsed rest of
+    the current chunk are held in memory, whatever the size of the whole array.
+
+    Parsing stops at the closing bracket; whatever follows it is not read. A body that is not an
+    array (e.g. an error object) yields nothing. Malformed JSON is reported as soon as it is seen
+    instead of after reading the rest of the body; only an unterminated string can make the parser
+    wait for more data.
+
+    Args:
+        chunks (iterable): Chunks of the UTF-8 encoded JSON document (bytes).
+        object_hook (callable): Passed on to the JSON decoder (e.g. a field projection).
+    Yields:
+        The array elements.
+    Raises:
+        ValueError: If the document ends before the array is closed or is not valid JSON.
+    """
+    decoder = json.JSONDecoder(object_hook=object_hook)
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    position = 0
+    eof = False
+    need_more = False
+    state = "start"  # start -> first -> (value -> after)* -> closed
+
+    while True:
+        while position < len(buffer) and buffer[position] in WHITESPACE:
+            position += 1
+        if need_more or position == len(buffer):
+            if eof:
+                break
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+                text = text_decoder.decode(b"", final=True)
+            else:
+                text = text_decoder.decode(chunk)
+            buffer = buffer[position:] + text
+            position = 0
+            need_more = False
+            continue
+
+        char = buffer[position]
+        if state == "start":
+            if char != "[":
+                return
+            position += 1
+            state = "first"
+        elif state == "first" and char == "]":
+            return
+        elif state in ("first", "value"):
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                if eof or (not e.msg.startswith("Unterminated")
+                           and len(buffer) - e.pos > MAX_TRUNCATED_TOKEN):
+                    raise
+                need_more = True
+                continue
+            if not eof and isinstance(value, (int, float)) and not buffer[end:].strip(NUMBER_CHARS):
+                # A number at the end of the buffer (e.g. "12." or "1e") may continue in the next chunk.
+                need_more = True
+                continue
+            position = end
+            state = "after"
+            yield value
+        elif char == ",":
+            position += 1
+            state = "value"
+        elif char == "]":
+            return
+        else:
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+
+    if state != "start":
+        raise ValueError("JSON array ended before its closing bracket")
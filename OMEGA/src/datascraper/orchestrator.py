@@ -0,0 +1,236 @@
+import argparse
+import contextlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from base_scraper import MAX_WORKERS, REQUESTS_PER_SECOND, BURST
+from http_transport import HttpTransport
+from quali_scraper import QualiScraper
+from race_scraper import RaceScraper
+from rate_limiter import TokenBucket
+from response_cache import ResponseCache
+from retry_policy import RetryPolicy
+
+# Scraper class per session type.
+SESSION_TYPES = {
+    "qualifying": QualiScraper,
+    "race": RaceScraper,
+}
+PROGRESS_INTERVAL = 10  # seconds between two progress lines
+
+
+def parse_years(text):
+    """
+    Parse a year selection such as "2023-2025" or "2023,2025" into a sorted list of years.
+    """
+    years = set()
+    for part in text.split(","):
+        part = part.strip()
+        first, _, last = part.partition("-")
+        if not first.isdigit() or (last and not last.isdigit()):
+            raise ValueError(f"Invalid year selection: {part!r}")
+        years.update(range(int(first), int(last or first) + 1))
+    return sorted(years)
+
+
+def format_bytes(count):
+    """
+    Format a byte count with a binary unit, e.g. 1536 -> "1.5 KiB".
+    """
+    for unit in ("B", "KiB", "MiB"):
+        if count < 1024:
+            return f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GiB"
+
+
+class ProgressReporter:
+    """
+    Counts the sessions processed by all scrapers and periodically prints progress and throughput
+    (sessions per minute, bytes per second received by the shared transport) to stderr.
+
+    Scrapers report to it through add_planned() and session_done().
+
+    Attributes:
+        transport (HttpTransport): Shared transport whose received bytes and requests are reported.
+        cache (ResponseCache): Shared response cache whose hits are reported, or None.
+        interval (float): Seconds between two progress lines.
+        planned (int): Number of sessions the scrapers announced they will process.
+        done (int): Number of sessions processed so far.
+    """
+
+    def __init__(self, transport, cache=None, interval=PROGRESS_INTERVAL, stream=None):
+        self.transport = transport
+        self.cache = cache
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.planned = 0
+        self.done = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_time = None
+        self._last = None  # (time, bytes received) of the previous progress line
+
+    def add_planned(self, count):
+        with self._lock:
+            self.planned += count
+
+    def session_done(self):
+        with self._lock:
+            self.done += 1
+
+    def start(self):
+        """
+        Start printing a progress line every interval seconds.
+        """
+        self._start_time = time.monotonic()
+        self._last = (self._start_time, self.transport.bytes_received)
+        self._thread = threading.Thread(target=self._loop, name="scrape-progress", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the periodic output and print the final totals.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.report(final=True)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.report()
+
+    def report(self, final=False):
+        """
+        Print one progress line. Byte throughput is measured since the previous line, or over the
+        whole run for the final line.
+        """
+        now = time.monotonic()
+        received = self.transport.bytes_received
+        elapsed = max(now - self._start_time, 1e-9)
+        since_time, since_bytes = (self._start_time, 0) if final else self._last
+        self._last = (now, received)
+        with self._lock:
+            planned, done = self.planned, self.done
+        line = (f"[{elapsed:7.1f}s] sessions {done}/{planned} ({done / elapsed * 60:.1f}/min), "
+                f"{format_bytes(received)} received ({format_bytes((received - since_bytes) / max(now - since_time, 1e-9))}/s), "
+                f"{self.transport.requests} requests")
+        if self.cache is not None:
+            line += f", {self.cache.hits} cache hits"
+        print(("Finished " if final else "") + line, file=self.stream, flush=True)
+
+
+def run_job(session_type, year, shared, args):
+    """
+    Scrape one season of one session type with the shared rate limiter, cache, transport and
+    request cap. Returns the scraper.
+    """
+    scraper = SESSION_TYPES[session_type](
+        str(year),
+        max_workers=args.workers,
+        rate_limiter=shared["rate_limiter"],
+        cache=shared["cache"],
+        use_cache=shared["cache"] is not None,
+        transport=shared["transport"],
+        in_flight=shared["in_flight"],
+        retry_policy=shared["retry_policy"],
+        progress=shared["progress"],
+    )
+    scraper.run()
+    return scraper
+
+
+def main(argv=None):
+    """
+    Scrape several seasons of qualifying and race sessions without prompting.
+
+    All scrapers share one rate limiter, response cache, pooled HTTP transport and cap on requests
+    in flight, so running them side by side never exceeds the API budget of a single scraper, while
+    the sessions of different seasons and session types are processed concurrently.
+
+    Example:
+        python orchestrator.py --years 2023-2025 --types qualifying,race
+    """
+    parser = argparse.ArgumentParser(description="Scrape OpenF1 lap data for a range of seasons.")
+    parser.add_argument("--years", default="2023-2025", help="years to scrape, e.g. 2023-2025 or 2023,2025")
+    parser.add_argument("--types", default=",".join(SESSION_TYPES),
+                        help=f"comma-separated session types ({', '.join(SESSION_TYPES)})")
+    parser.add_argument("--parallel", type=int, default=None,
+                        help="number of season scrapers running at the same time (default: all)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="sessions processed at a time per scraper")
+    parser.add_argument("--max-in-flight", type=int, default=MAX_WORKERS,
+                        help="HTTP requests in flight at the same time across all scrapers")
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, help="average requests per second")
+    parser.add_argument("--burst", type=float, default=BURST, help="requests that may be sent back to back")
+    parser.add_argument("--retries", type=int, default=2, help="retry rounds for incomplete sessions")
+    parser.add_argument("--retry-delay", type=float, default=0.0,
+                        help="seconds to wait before the first retry round (doubles every round)")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch from the network")
+    parser.add_argument("--offline", action="store_true", help="serve responses only from the cache")
+    parser.add_argument("--progress-interval", type=float, default=PROGRESS_INTERVAL,
+                        help="seconds between progress lines")
+    parser.add_argument("--quiet", action="store_true", help="only print progress, not the scrapers' output")
+    parser.add_argument("--api-base", default=None, help="send API requests to this base URL instead (stub server)")
+    args = parser.parse_args(argv)
+
+    try:
+        years = parse_years(args.years)
+    except ValueError as e:
+        parser.error(str(e))
+    session_types = [name.strip().lower() for name in args.types.split(",") if name.strip()]
+    unknown = [name for name in session_types if name not in SESSION_TYPES]
+    if unknown:
+        parser.error(f"Unknown session type(s): {', '.join(unknown)}")
+    if args.no_cache and args.offline:
+        parser.error("--offline needs the cache")
+
+    transport = HttpTransport(pool_size=args.max_in_flight, api_base=args.api_base)
+    cache = None if args.no_cache else ResponseCache(offline=args.offline)
+    progress = ProgressReporter(transport, cache, args.progress_interval)
+    shared = {
+        "rate_limiter": TokenBucket(args.rate, args.burst),
+        "cache": cache,
+        "transport": transport,
+        "in_flight": threading.BoundedSemaphore(max(1, args.max_in_flight)),
+        "retry_policy": RetryPolicy(max_attempts=args.retries, delay=args.retry_delay),
+        "progress": progress,
+    }
+    jobs = [(session_type, year) for year in years for session_type in session_types]
+    print(f"Scraping {len(jobs)} season(s): " + ", ".join(f"{t} {y}" for t, y in jobs), file=sys.stderr)
+
+    failed = []
+    progress.start()
+    output = open(os.devnull, "w") if args.quiet else sys.stdout
+    try:
+        with contextlib.redirect_stdout(output), \
+                ThreadPoolExecutor(max_workers=args.parallel or len(jobs)) as executor:
+            futures = {executor.submit(run_job, session_type, year, shared, args): (session_type, year)
+                       for session_type, year in jobs}
+            for future in as_completed(futures):
+                session_type, year = futures[future]
+                try:
+                    future.result()
+                    print(f"Finished {session_type} {year}.", file=sys.stderr)
+                except Exception as e:
+                    failed.append((session_type, year))
+                    print(f"Scraping {session_type} {year} failed: {e}", file=sys.stderr)
+    finally:
+        progress.stop()
+        if cache is not None:
+            cache.flush()
+        transport.close()
+        if output is not sys.stdout:
+            output.close()
+    if failed:
+        print("Failed: " + ", ".join(f"{t} {y}" for t, y in failed), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,8 @@
 from base_scraper import BaseScraper
 
 class QualiScraper(BaseScraper):
-    def __init__(self, year: str):
-        super().__init__(year)
+    def __init__(self, year: str, **kwargs):
+        super().__init__(year, **kwargs)
         self.output_prefix = "quali_laps"  # Filename prefix for Qualifying data
 
     def fetch_sessions(self):
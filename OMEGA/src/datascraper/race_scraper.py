@@ -1,8 +1,8 @@
 from base_scraper import BaseScraper
 
 class RaceScraper(BaseScraper):
-    def __init__(self, year: str):
-        super().__init__(year)
+    def __init__(self, year: str, **kwargs):
+        super().__init__(year, **kwargs)
         self.output_prefix = "race_laps"  # Filename prefix for Race data
 
     def fetch_sessions(self):
@@ -0,0 +1,70 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to pace requests to the OpenF1 API.
+
+    Tokens are refilled continuously at `rate` tokens per second up to `capacity`.
+    Every request takes one token; callers block until a token is available.
+
+    Attributes:
+        rate (float): Refill rate in tokens per second.
+        capacity (float): Maximum number of tokens the bucket can hold (burst size).
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        Initialize a new TokenBucket.
+
+        Args:
+            rate (float): Number of tokens added per second.
+            capacity (float): Maximum burst size.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """
+        Add the tokens accumulated since the last refill. Must be called with the lock held.
+        """
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def acquire(self, tokens: float = 1):
+        """
+        Block until the requested number of tokens is available and take them.
+
+        Args:
+            tokens (float): Number of tokens to take.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait_time = (tokens - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+    def penalize(self, seconds: float):
+        """
+        Drain the bucket so that no request is made for the given number of seconds.
+        Used when the server signals that we are going too fast (e.g. HTTP 429).
+
+        Args:
+            seconds (float): Time to hold back all callers.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
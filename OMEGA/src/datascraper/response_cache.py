@@ -0,0 +1,372 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse, parse_qs
+
+CACHE_DIR = os.path.join("data", "cache", "openf1")
+MAX_CACHE_BYTES = 512 * 1024 * 1024  # LRU eviction starts above this size
+INDEX_SAVE_EVERY = 32  # index changes collected before the index file is rewritten (flush() writes the rest)
+INDEX_SAVE_SECONDS = 30  # ... or the age of the oldest unsaved change that forces a rewrite
+STALE_TMP_SECONDS = 3600  # partial bodies older than this are left over from a crash and removed at start
+
+# Time-to-live in seconds per OpenF1 endpoint. Responses of historical sessions
+# never change, so the scraper marks them immutable and they skip the TTL check.
+DEFAULT_TTLS = {
+    "sessions": 6 * 3600,
+    "drivers": 3600,
+    "laps": 600,
+    "stints": 600,
+    "weather": 600,
+}
+DEFAULT_TTL = 600
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache for raw OpenF1 responses.
+
+    Response bodies are stored content-addressed (file name = SHA-256 of the body), so identical
+    payloads such as empty lists are stored once. A JSON index maps every URL to its blob and
+    keeps the timestamps needed for TTL checks and least-recently-used eviction.
+
+    Blobs are reference-counted: a blob is deleted as soon as no URL points to it any more, and the
+    size limit covers every blob on disk; a body larger than the whole limit is not cached. The
+    index file is rewritten every INDEX_SAVE_EVERY changes (or INDEX_SAVE_SECONDS after an unsaved
+    change) and by flush(); blobs left without an index entry and partial bodies left by a crash
+    are removed on the next start.
+
+    Attributes:
+        cache_dir (str): Directory holding the index and the blobs.
+        max_bytes (int): Size limit for all stored blobs.
+        ttls (dict): Time-to-live in seconds per endpoint name.
+        offline (bool): When True, expired entries are still served and misses never hit the network.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, ttls=None, offline=False):
+        """
+        Initialize the cache and load its index from disk.
+
+        Args:
+            cache_dir (str): Directory holding the index and the blobs.
+            max_bytes (int): Size limit for all stored blobs.
+            ttls (dict): Optional per-endpoint TTL overrides.
+            offline (bool): Serve only from the cache ("cache-only" mode).
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._blob_dir = os.path.join(cache_dir, "blobs")
+        self._index_path = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+        os.makedirs(self._blob_dir, exist_ok=True)
+        self._index = self._load_index()
+        self._references = Counter(entry["blob"] for entry in self._index.values())
+        self._blob_sizes = self._scan_blobs()
+        self._unsaved_changes = 0
+        self._first_unsaved = None
+
+    @staticmethod
+    def endpoint_of(url: str) -> str:
+        """
+        Return the OpenF1 endpoint name of a URL (e.g. "laps" for /v1/laps?...).
+        """
+        return urlparse(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+    def ttl_for(self, url: str, immutable=False):
+        """
+        Return the TTL in seconds for a URL, or None if the response never expires.
+
+        Args:
+            url (str): Requested URL.
+            immutable (bool): True if the response belongs to a finished, historical session.
+        """
+        if immutable:
+            return None
+        return self.ttls.get(self.endpoint_of(url), DEFAULT_TTL)
+
+    def _load_index(self):
+        """
+        Load the URL index, dropping entries whose blob is missing.
+        """
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {url: entry for url, entry in index.items()
+                if os.path.exists(self._blob_path(entry["blob"]))}
+
+    def _scan_blobs(self):
+        """
+        Return the size of every blob on disk, deleting blobs no index entry refers to and partial
+        bodies (CacheWriter temporary files) older than STALE_TMP_SECONDS.
+        """
+        sizes = {}
+        now = time.time()
+        for name in os.listdir(self._blob_dir):
+            prefix_dir = os.path.join(self._blob_dir, name)
+            if name.endswith(".tmp"):
+                # Younger files may belong to another process that is still writing them.
+                try:
+                    if now - os.path.getmtime(prefix_dir) > STALE_TMP_SECONDS:
+                        os.remove(prefix_dir)
+                except OSError:
+                    pass
+                continue
+            if len(name) != 2 or not os.path.isdir(prefix_dir):
+                continue
+            for digest in os.listdir(prefix_dir):
+                path = os.path.join(prefix_dir, digest)
+                if digest.endswith(".tmp"):
+                    continue
+                if self._references[digest] == 0:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                    continue
+                sizes[digest] = os.path.getsize(path)
+        return sizes
+
+    def _save_index(self):
+        """
+        Atomically write the URL index to disk. Must be called with the lock held.
+        """
+        tmp_path = f"{self._index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+        self._unsaved_changes = 0
+        self._first_unsaved = None
+
+    def _index_changed(self):
+        """
+        Count an index change and write the index once enough changes have collected.
+        Must be called with the lock held.
+        """
+        now = time.monotonic()
+        if self._first_unsaved is None:
+            self._first_unsaved = now
+        self._unsaved_changes += 1
+        if self._unsaved_changes >= INDEX_SAVE_EVERY or now - self._first_unsaved >= INDEX_SAVE_SECONDS:
+            self._save_index()
+
+    def _remove_entry(self, url: str):
+        """
+        Drop the index entry of a URL and delete its blob if no other URL refers to it.
+        Must be called with the lock held.
+        """
+        entry = self._index.pop(url, None)
+        if entry is None:
+            return
+        digest = entry["blob"]
+        self._references[digest] -= 1
+        if self._references[digest] <= 0:
+            del self._references[digest]
+            self._blob_sizes.pop(digest, None)
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self._blob_dir, digest[:2], digest)
+
+    def get(self, url: str, ttl=None):
+        """
+        Return the cached body for a URL if present and fresh.
+
+        Args:
+            url (str): Requested URL.
+            ttl (float): Maximum age in seconds, or None for no expiry.
+        Returns:
+            The cached response body as bytes, or None on a miss.
+        """
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None or (not self.offline and ttl is not None
+                                 and time.time() - entry["stored_at"] > ttl):
+                self.misses += 1
+                return None
+            try:
+                with open(self._blob_path(entry["blob"]), "rb") as f:
+                    body = f.read()
+            except OSError:
+                self._remove_entry(url)
+                self.misses += 1
+                return None
+            entry["last_used"] = time.time()
+            self.hits += 1
+            return body
+
+    def open(self, url: str, ttl=None):
+        """
+        Open the cached body for a URL for reading, if present and fresh, so it can be parsed
+        in chunks instead of being loaded at once.
+
+        Args:
+            url (str): Requested URL.
+            ttl (float): Maximum age in seconds, or None for no expiry.
+        Returns:
+            A binary file object (to be closed by the caller), or None on a miss.
+        """
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None or (not self.offline and ttl is not None
+                                 and time.time() - entry["stored_at"] > ttl):
+                self.misses += 1
+                return None
+            try:
+                body_file = open(self._blob_path(entry["blob"]), "rb")
+            except OSError:
+                self._remove_entry(url)
+                self.misses += 1
+                return None
+            entry["last_used"] = time.time()
+            self.hits += 1
+            return body_file
+
+    def put(self, url: str, body: bytes):
+        """
+        Store a response body for a URL and evict old entries if the cache is too large.
+
+        Args:
+            url (str): Requested URL.
+            body (bytes): Raw response body.
+        """
+        writer = self.writer(url)
+        writer.write(body)
+        writer.commit()
+
+    def writer(self, url: str):
+        """
+        Return a CacheWriter storing a response body for a URL chunk by chunk, as it is received.
+        """
+        return CacheWriter(self, url)
+
+    def _store(self, url: str, digest: str, size: int, tmp_path: str):
+        """
+        Move a completely written body into the blob store and point the URL at it. A body larger
+        than max_bytes is discarded instead, together with the URL's previous entry.
+        """
+        path = self._blob_path(digest)
+        with self._lock:
+            if size > self.max_bytes:
+                os.remove(tmp_path)
+                if url in self._index:
+                    self._remove_entry(url)
+                    self._index_changed()
+                return
+            if os.path.exists(path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+            self._blob_sizes[digest] = size
+            # Take the new reference before dropping the old one, so a refetch with an unchanged
+            # body keeps its blob.
+            self._references[digest] += 1
+            self._remove_entry(url)
+            now = time.time()
+            self._index[url] = {"blob": digest, "size": size, "stored_at": now, "last_used": now}
+            self._evict(keep=url)
+            self._index_changed()
+
+    def _evict(self, keep=None):
+        """
+        Drop least-recently-used entries until the blobs on disk fit into max_bytes, never the
+        entry of the URL `keep` (the one just stored). Must be called with the lock held.
+        """
+        total = sum(self._blob_sizes.values())
+        if total <= self.max_bytes:
+            return
+        for url, entry in sorted(self._index.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if url == keep:
+                continue
+            shared = self._references[entry["blob"]] > 1
+            self._remove_entry(url)
+            if not shared:
+                total -= entry["size"]
+
+    def discard(self, url: str):
+        """
+        Remove the cached response of a single URL (e.g. a corrupt entry).
+        """
+        with self._lock:
+            if url in self._index:
+                self._remove_entry(url)
+                self._index_changed()
+
+    def invalidate_session(self, session_key):
+        """
+        Remove every cached response that belongs to the given session so it is fetched again.
+
+        Args:
+            session_key: Key of the session whose responses should be dropped.
+        """
+        session_key = str(session_key)
+        with self._lock:
+            stale = [url for url in self._index
+                     if parse_qs(urlparse(url).query).get("session_key") == [session_key]]
+            for url in stale:
+                self._remove_entry(url)
+            if stale:
+                self._index_changed()
+
+    def flush(self):
+        """
+        Persist the index, including last-used timestamps updated by cache hits.
+        Call it before exiting; changes since the last automatic write are lost otherwise.
+        """
+        with self._lock:
+            self._save_index()
+
+
+class CacheWriter:
+    """
+    Writes one response body into a ResponseCache while it is being received.
+
+    Chunks go to a temporary file and into a running SHA-256; commit() files the finished body
+    under its digest. A body that is never committed (e.g. the download failed) is discarded by
+    abort(), so a partial response is never served from the cache.
+    """
+
+    def __init__(self, cache: ResponseCache, url: str):
+        self.cache = cache
+        self.url = url
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._tmp_path = os.path.join(cache._blob_dir, f".{threading.get_ident()}.{id(self)}.tmp")
+        self._file = open(self._tmp_path, "wb")
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+        self._digest.update(chunk)
+        self.size += len(chunk)
+
+    def commit(self):
+        """
+        Store the written body in the cache.
+        """
+        self._file.close()
+        self.cache._store(self.url, self._digest.hexdigest(), self.size, self._tmp_path)
+
+    def abort(self):
+        """
+        Discard the written body.
+        """
+        if self._file.closed:
+            return
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
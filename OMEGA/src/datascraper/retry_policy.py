@@ -0,0 +1,47 @@
+class RetryPolicy:
+    """
+    Decides how often incomplete sessions are re-scraped at the end of a run and how long to wait
+    before each round.
+
+    The wait before round n (0-based) is delay * backoff ** n, capped at max_delay. Waiting gives
+    live sessions time to receive their missing data and the API time to recover from errors.
+
+    Attributes:
+        max_attempts (int): Number of retry rounds (0 disables retries).
+        delay (float): Seconds to wait before the first round.
+        backoff (float): Factor the wait grows by with every round.
+        max_delay (float): Upper bound of the wait in seconds.
+    """
+
+    def __init__(self, max_attempts=2, delay=0.0, backoff=2.0, max_delay=300.0):
+        """
+        Initialize a new RetryPolicy.
+
+        Args:
+            max_attempts (int): Number of retry rounds.
+            delay (float): Seconds to wait before the first round.
+            backoff (float): Factor the wait grows by with every round.
+            max_delay (float): Upper bound of the wait in seconds.
+        """
+        if max_attempts < 0:
+            raise ValueError("max_attempts must not be negative")
+        if delay < 0 or max_delay < 0:
+            raise ValueError("delays must not be negative")
+        if backoff < 1:
+            raise ValueError("backoff must be at least 1")
+        self.max_attempts = max_attempts
+        self.delay = delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+
+    def should_retry(self, attempt: int) -> bool:
+        """
+        Check whether retry round `attempt` (0-based) may run.
+        """
+        return attempt < self.max_attempts
+
+    def delay_for(self, attempt: int) -> float:
+        """
+        Return the number of seconds to wait before retry round `attempt` (0-based).
+        """
+        return min(self.max_delay, self.delay * self.backoff ** attempt)
@@ -1,10 +1,94 @@
 import sys
 import os
+import io
+import threading
+import numpy as np
 import pandas as pd
 
 # Adjust sys.path to ensure that the F1PredictionModel can be imported.
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from OMEGA.src.website.model.model_loader import F1PredictionModel
+from OMEGA.src.website.model.model_loader import F1PredictionModel, DEFAULT_LAP_TIME
+from .prediction_cache import PredictionCache
+from .stage_timer import StageTimer
+
+# Input fields every prediction request must contain.
+REQUIRED_FIELDS = ['st_speed', 'compound', 'air_temperature', 'rainfall',
+                   'wind_direction', 'wind_speed']
+# Maximum number of scenarios accepted by a single batch prediction request.
+MAX_BATCH_SIZE = 1000
+
+# Numeric axes of a grid prediction, in the order of the result array dimensions (after compound).
+GRID_AXES = ['st_speed', 'air_temperature', 'rainfall', 'wind_direction', 'wind_speed']
+# Maximum number of condition combinations evaluated by a single grid request.
+MAX_GRID_POINTS = 200000
+
+# Basic information for each team shown on the website.
+TEAM_BASE_DATA = [
+    {
+        "id": 1,
+        "name": "Red Bull Racing",
+        "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/red-bull-racing-logo.png.transform/2col/image.png",
+    },
+    {
+        "id": 2,
+        "name": "Ferrari",
+        "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/ferrari-logo.png.transform/2col/image.png",
+    },
+    {
+        "id": 3,
+        "name": "Mercedes",
+        "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/mercedes-logo.png.transform/2col/image.png",
+    },
+    {
+        "id": 4,
+        "name": "McLaren",
+        "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/mclaren-logo.png.transform/2col/image.png",
+    },
+    {
+        "id": 5,
+        "name": "Aston Martin",
+        "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/aston-martin-logo.png.transform/2col/image.png",
+    },
+    {
+        "id": 6,
+        "name": "Alpine F1 Team",
+        "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/alpine-logo.png.transform/2col/image.png",
+    },
+    {
+        "id": 7,
+        "name": "Williams",
+        "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/williams-logo.png.transform/2col/image.png",
+    },
+    {
+        "id": 8,
+        "name": "AlphaTauri",
+        "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/alphatauri-logo.png.transform/2col/image.png",
+    },
+    {
+        "id": 9,
+        "name": "Alfa Romeo",
+        "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/alfa-romeo-logo.png.transform/2col/image.png",
+    },
+    {
+        "id": 10,
+        "name": "Haas F1 Team",
+        "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/haas-f1-team-logo.png.transform/2col/image.png",
+    }
+]
+
+# Map team names to the CSV lookup names used in the performance metrics.
+TEAM_NAME_MAP = {
+    "Red Bull Racing": "Red Bull Racing",
+    "Ferrari": "Ferrari",
+    "Mercedes": "Mercedes",
+    "McLaren": "McLaren",
+    "Aston Martin": "Aston Martin",
+    "Alpine F1 Team": "Alpine",
+    "Williams": "Williams",
+    "AlphaTauri": "RB & AlphaTauri",
+    "Alfa Romeo": "Alfa Romeo & Kick Sauber",
+    "Haas F1 Team": "Haas F1 Team"
+}
 
 
 class PredictController:
@@ -18,6 +102,10 @@ class PredictController:
         Initialize the PredictController by loading the prediction model and setting up
         the directory paths for performance metrics CSV files.
         """
+        config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config.json')
+        # Stage timings and status gauges exported at /api/metrics, configured in config.json.
+        self.timer = StageTimer.from_config(config_path)
+
         # Load the pre-trained F1 prediction model.
         self.model = F1PredictionModel()
 
@@ -27,19 +115,25 @@ class PredictController:
         self.metrics_dir = os.path.join(self.base_dir, 'datascraper', 'data', 'performance_logic',
                                         'performance_metrics')
 
-        # Debug: Print the base and metrics directory paths.
-        print(f"Base directory: {self.base_dir}")
-        print(f"Metrics directory: {self.metrics_dir}")
-
         # Define paths for each performance metrics CSV file.
         self.differences_path = os.path.join(self.metrics_dir, 'performance_differences.csv')
         self.speed_path = os.path.join(self.metrics_dir, 'performance_speed.csv')
         self.wet_path = os.path.join(self.metrics_dir, 'performance_wet.csv')
 
-        # Verify file existence and print status for debugging.
-        print(f"Differences file exists: {os.path.exists(self.differences_path)}")
-        print(f"Speed file exists: {os.path.exists(self.speed_path)}")
-        print(f"Wet file exists: {os.path.exists(self.wet_path)}")
+        # Export where the metrics files are looked up and whether each of them exists. The path is
+        # relative to base_dir, so the unauthenticated metrics page does not reveal the server's layout.
+        self.timer.set_gauge("metrics_directory_info", 1,
+                             path=os.path.relpath(self.metrics_dir, self.base_dir).replace(os.sep, '/'))
+        for path in (self.differences_path, self.speed_path, self.wet_path):
+            self.timer.set_gauge("metrics_file_present", int(os.path.exists(path)), file=os.path.basename(path))
+
+        # Team metrics derived from the CSV files, cached until one of the files changes.
+        self._team_metrics = None
+        self._team_metrics_mtimes = None
+        self._metrics_lock = threading.Lock()
+
+        # Cache of predictions keyed on the (quantised) input conditions, configured in config.json.
+        self.prediction_cache = PredictionCache.from_config(config_path)
 
     def predict_performance(self, data):
         """
@@ -53,188 +147,384 @@ class PredictController:
             tuple: A tuple with a response dictionary and an HTTP status code.
         """
         # Check for all required fields in the input data.
-        required_fields = ['st_speed', 'compound', 'air_temperature', 'rainfall',
-                           'wind_direction', 'wind_speed']
-        for field in required_fields:
-            if field not in data:
-                return {"error": f"Missing required field: {field}"}, 400
+        missing_field = self._find_missing_field(data)
+        if missing_field:
+            return {"error": f"Missing required field: {missing_field}"}, 400
 
         try:
-            # Predict the base lap time using the pre-trained model.
-            base_lap_time = self.model.predict(data)
+            with self.timer.stage("cache_lookup"):
+                # Normalise the numeric inputs; quantised values are what the model and the teams see.
+                conditions = self.prediction_cache.quantize(data)
+                key = self.prediction_cache.make_key(conditions)
+                version = self._data_version()
+                cached = self.prediction_cache.get(key, version)
+
+            if cached is None:
+                # Predict the base lap time using the pre-trained model.
+                with self.timer.stage("model_predict"):
+                    base_lap_time = self.model.predict(conditions, default=None)
+                # A failed prediction is answered with the default lap time but never cached.
+                predicted = base_lap_time is not None
+                if not predicted:
+                    base_lap_time = DEFAULT_LAP_TIME
+                base_performance = 100 - (base_lap_time - 85) * 1.0
+                teams = self._get_team_predictions(base_performance, conditions)
+                if teams and predicted:
+                    self.prediction_cache.put(key, version, (base_lap_time, teams))
+            else:
+                base_lap_time, teams = cached
 
-            # Convert lap time to a performance score (lower lap time equals higher performance).
-            # Arbitrary scale: 85s = 100%, 95s = 90%
-            base_performance = 100 - (base_lap_time - 85) * 1.0
+            # Copy the cached team entries so the response never shares state with the cache.
+            return self._build_prediction(data, base_lap_time, [dict(team) for team in teams]), 200
 
-            # Get team-specific predictions based on the base performance and conditions.
-            teams = self._get_team_predictions(base_performance, data)
+        except Exception as e:
+            # Return an error response if prediction fails.
+            return {"error": f"Prediction failed: {str(e)}"}, 500
 
-            # Create a summary of the race conditions.
-            race_conditions = {
-                "trackTemp": str(float(data['air_temperature']) + 10),
-                "airTemp": data['air_temperature'],
-                "humidity": str(round(50 + (float(data['air_temperature']) / 100 * 30), 1)),
-                "windSpeed": data['wind_speed'],
-                "windDirection": data['wind_direction'],
-                "rainfall": data['rainfall'],
-                "compound": data['compound'],
-                "predictedLapTime": str(base_lap_time)
-            }
+    def predict_batch_performance(self, scenarios):
+        """
+        Predict performance for many sets of conditions with a single model call.
+
+        Args:
+            scenarios (list): List of input dictionaries, each in the format accepted by predict_performance().
 
-            # Return a formatted response with team predictions and race conditions.
+        Returns:
+            tuple: A tuple with a response dictionary ({"scenarios": [...]}, one prediction per input
+                   in the same order) and an HTTP status code.
+        """
+        if not isinstance(scenarios, list) or not scenarios:
+            return {"error": "Scenarios must be a non-empty list"}, 400
+        if len(scenarios) > MAX_BATCH_SIZE:
+            return {"error": f"Too many scenarios: at most {MAX_BATCH_SIZE} per request"}, 400
+        for index, data in enumerate(scenarios):
+            if not isinstance(data, dict):
+                return {"error": f"Scenario {index} must be an object"}, 400
+            missing_field = self._find_missing_field(data)
+            if missing_field:
+                return {"error": f"Scenario {index}: Missing required field: {missing_field}"}, 400
+
+        try:
+            with self.timer.stage("model_predict_batch"):
+                base_lap_times = self.model.predict_batch(scenarios)
             return {
-                "teams": teams,
-                "raceConditions": race_conditions,
-                "trackName": "F1 Comparator"
+                "scenarios": [self._build_prediction(data, base_lap_time)
+                              for data, base_lap_time in zip(scenarios, base_lap_times)]
             }, 200
 
         except Exception as e:
             # Return an error response if prediction fails.
             return {"error": f"Prediction failed: {str(e)}"}, 500
 
-    def _get_team_predictions(self, base_performance, conditions):
+    def predict_grid(self, spec):
         """
-        Calculate team performance predictions based on base performance and additional CSV metrics.
+        Evaluate every team over a grid of conditions, for heatmaps.
+
+        Team values derived from the CSVs are looked up once, the base lap time of every grid point
+        comes from one batched model call, and the per-team modifier of _calculate_performance_modifier
+        is evaluated with NumPy broadcasting over the whole grid.
 
         Args:
-            base_performance (float): The base performance score computed from lap time.
-            conditions (dict): Input conditions used for further performance adjustments.
+            spec (dict): One entry per axis in GRID_AXES plus 'compound'. A numeric axis is a single
+                         value, a list of values, or {"start", "stop", "num"} (inclusive linspace).
+                         'compound' is a compound name or a list of names.
 
         Returns:
-            list: A sorted list of team dictionaries with their performance scores.
+            tuple: (.npz bytes, 200) on success, otherwise (error dictionary, HTTP status code).
+                   The archive holds:
+                     performance  float32 (teams, compound, st_speed, air_temperature, rainfall,
+                                  wind_direction, wind_speed): final performance, not rounded
+                     lap_time     float32 (compound, st_speed, ...): predicted base lap time
+                     teams, compound, st_speed, ...: the axis values
         """
-        # Define basic information for each team.
-        team_base_data = [
-            {
-                "id": 1,
-                "name": "Red Bull Racing",
-                "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/red-bull-racing-logo.png.transform/2col/image.png",
-            },
-            {
-                "id": 2,
-                "name": "Ferrari",
-                "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/ferrari-logo.png.transform/2col/image.png",
-            },
-            {
-                "id": 3,
-                "name": "Mercedes",
-                "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/mercedes-logo.png.transform/2col/image.png",
-            },
-            {
-                "id": 4,
-                "name": "McLaren",
-                "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/mclaren-logo.png.transform/2col/image.png",
-            },
-            {
-                "id": 5,
-                "name": "Aston Martin",
-                "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/aston-martin-logo.png.transform/2col/image.png",
-            },
-            {
-                "id": 6,
-                "name": "Alpine F1 Team",
-                "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/alpine-logo.png.transform/2col/image.png",
-            },
-            {
-                "id": 7,
-                "name": "Williams",
-                "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/williams-logo.png.transform/2col/image.png",
-            },
-            {
-                "id": 8,
-                "name": "AlphaTauri",
-                "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/alphatauri-logo.png.transform/2col/image.png",
-            },
-            {
-                "id": 9,
-                "name": "Alfa Romeo",
-                "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/alfa-romeo-logo.png.transform/2col/image.png",
-            },
-            {
-                "id": 10,
-                "name": "Haas F1 Team",
-                "logo": "https://www.formula1.com/content/dam/fom-website/teams/2023/haas-f1-team-logo.png.transform/2col/image.png",
-            }
-        ]
-
-        # Map team names to the CSV lookup names used in the performance metrics.
-        team_name_map = {
-            "Red Bull Racing": "Red Bull Racing",
-            "Ferrari": "Ferrari",
-            "Mercedes": "Mercedes",
-            "McLaren": "McLaren",
-            "Aston Martin": "Aston Martin",
-            "Alpine F1 Team": "Alpine",
-            "Williams": "Williams",
-            "AlphaTauri": "RB & AlphaTauri",
-            "Alfa Romeo": "Alfa Romeo & Kick Sauber",
-            "Haas F1 Team": "Haas F1 Team"
-        }
+        if not isinstance(spec, dict):
+            return {"error": "Grid specification must be an object"}, 400
+        try:
+            axes = {name: self._grid_axis(spec, name) for name in GRID_AXES}
+            compounds = spec.get('compound')
+            compounds = [compounds] if isinstance(compounds, str) else compounds
+            if not compounds or not all(isinstance(compound, str) for compound in compounds):
+                raise ValueError("compound must be a name or a non-empty list of names")
+        except KeyError as e:
+            return {"error": f"Invalid grid specification: missing {e.args[0]}"}, 400
+        except (TypeError, ValueError) as e:
+            return {"error": f"Invalid grid specification: {e}"}, 400
+
+        shape = (len(compounds),) + tuple(len(axes[name]) for name in GRID_AXES)
+        if int(np.prod(shape)) > MAX_GRID_POINTS:
+            return {"error": f"Grid too large: at most {MAX_GRID_POINTS} points per request"}, 400
 
         try:
-            # Load performance metrics CSVs.
-            diff_df = pd.read_csv(self.differences_path)
-            diff_df.columns = [col.strip() for col in diff_df.columns]
+            team_metrics = self._load_team_metrics()
+            if team_metrics is None:
+                return {"error": "Performance metrics could not be loaded"}, 500
+
+            # Every grid point as flat columns, compound varying slowest.
+            mesh = np.meshgrid(np.arange(len(compounds)), *(axes[name] for name in GRID_AXES), indexing='ij')
+            compound_index = mesh[0].ravel()
+            columns = {name: grid.ravel() for name, grid in zip(GRID_AXES, mesh[1:])}
+
+            with self.timer.stage("grid_model_predict"):
+                numeric = np.column_stack([columns[name] for name in GRID_AXES])
+                point_compounds = np.array(compounds, dtype=object)[compound_index]
+                base_lap_time = self.model.predict_matrix(self.model.encode_columns(numeric, point_compounds))
+            base_performance = 100 - (base_lap_time - 85) * 1.0
+
+            with self.timer.stage("grid_team_modifiers"):
+                teams = [team_metrics["teams"][team["name"]] for team in TEAM_BASE_DATA]
+                base_modifier = np.array([team["baseModifier"] for team in teams], dtype=float)[:, None]
+                modifier = self._grid_performance_modifier(
+                    np.array([team["powerUnit"] for team in teams], dtype=float)[:, None],
+                    np.array([team["wetPerformance"] for team in teams], dtype=float)[:, None],
+                    np.array(compounds, dtype=object)[compound_index], columns)
+                performance = base_performance[None, :] * base_modifier + modifier
+
+            buffer = io.BytesIO()
+            np.savez(buffer,
+                     performance=performance.reshape((len(teams),) + shape).astype(np.float32),
+                     lap_time=base_lap_time.reshape(shape).astype(np.float32),
+                     teams=np.array([team["name"] for team in TEAM_BASE_DATA]),
+                     compound=np.array(compounds),
+                     **axes)
+            return buffer.getvalue(), 200
+
+        except Exception as e:
+            return {"error": f"Grid prediction failed: {str(e)}"}, 500
 
-            speed_df = pd.read_csv(self.speed_path)
-            speed_df.columns = [col.strip() for col in speed_df.columns]
+    @staticmethod
+    def _grid_axis(spec, name):
+        """
+        Turn one axis of a grid specification into a 1-D float array.
+        """
+        axis = spec[name]
+        if isinstance(axis, dict):
+            values = np.linspace(float(axis["start"]), float(axis["stop"]), int(axis["num"]))
+        else:
+            values = np.atleast_1d(np.asarray(axis, dtype=float))
+        if values.ndim != 1 or not len(values):
+            raise ValueError(f"{name} must contain at least one value")
+        return values
+
+    @staticmethod
+    def _grid_performance_modifier(power_unit, wet_performance, compounds, columns):
+        """
+        Vectorised _calculate_performance_modifier over grid points (columns) for all teams at once.
 
-            wet_df = pd.read_csv(self.wet_path)
-            wet_df.columns = [col.strip() for col in wet_df.columns]
+        The effects are added in the same order as in the scalar version (an inactive effect adds 0.0),
+        so every element equals the scalar result exactly.
 
-            # Calculate speed ranges for normalization.
-            max_speed = speed_df['Average Max Speed'].max()
-            min_speed = speed_df['Average Max Speed'].min()
-            speed_range = max_speed - min_speed
+        Args:
+            power_unit (numpy.ndarray): Power unit score per team, shape (teams, 1).
+            wet_performance (numpy.ndarray): Wet performance score per team, shape (teams, 1).
+            compounds (numpy.ndarray): Compound of each grid point, shape (points,).
+            columns (dict): Numeric condition of each grid point, one array of shape (points,) per field.
+
+        Returns:
+            numpy.ndarray: Performance modifier of shape (teams, points).
+        """
+        # Adjust modifier based on tire compound.
+        soft = compounds == "Soft"
+        hard = compounds == "Hard"
+        wet = (compounds == "Wet") | (compounds == "Intermediate")
+        tire_effect = np.where(soft, (power_unit - 80) / 200,
+                               np.where(hard, (90 - power_unit) / 200,
+                                        np.where(wet, (wet_performance - 80) / 100, 0.0)))
+        performance_modifier = 0 + tire_effect
 
-            max_wet_speed = wet_df['Average Wet Max Speed'].max()
-            min_wet_speed = wet_df['Average Wet Max Speed'].min()
-            wet_range = max_wet_speed - min_wet_speed
+        # Adjust based on air temperature.
+        air_temp = columns['air_temperature']
+        temp_effect = np.where(air_temp > 30, (air_temp - 30) / 100,
+                               np.where(air_temp < 15, (15 - air_temp) / 100, 0.0))
+        performance_modifier = performance_modifier + temp_effect
 
-            # Debug: Print speed ranges.
-            print(f"Speed range: {min_speed} - {max_speed}")
-            print(f"Wet speed range: {min_wet_speed} - {max_wet_speed}")
+        # Adjust based on rainfall.
+        rainfall = columns['rainfall']
+        performance_modifier = performance_modifier + np.where(rainfall > 0, (rainfall * wet_performance) / 1000, 0.0)
 
-        except Exception as e:
-            print(f"Error loading CSV data: {e}")
+        # Adjust based on straight-line speed.
+        st_speed = columns['st_speed']
+        performance_modifier = performance_modifier + np.where(st_speed > 330, (power_unit - 80) / 200, 0.0)
+
+        return performance_modifier
+
+    @staticmethod
+    def _find_missing_field(data):
+        """
+        Return the first required input field missing from data, or None if all are present.
+        """
+        for field in REQUIRED_FIELDS:
+            if field not in data:
+                return field
+        return None
+
+    def _build_prediction(self, data, base_lap_time, teams=None):
+        """
+        Build the prediction response for one set of conditions from its predicted base lap time.
+
+        Args:
+            data (dict): Input conditions.
+            base_lap_time (float): Lap time predicted by the model for these conditions.
+            teams (list): Already computed team rankings; computed from data when omitted.
+
+        Returns:
+            dict: Team rankings, race conditions summary and track name.
+        """
+        if teams is None:
+            # Convert lap time to a performance score (lower lap time equals higher performance).
+            # Arbitrary scale: 85s = 100%, 95s = 90%
+            base_performance = 100 - (base_lap_time - 85) * 1.0
+
+            # Get team-specific predictions based on the base performance and conditions.
+            teams = self._get_team_predictions(base_performance, data)
+
+        # Create a summary of the race conditions.
+        race_conditions = {
+            "trackTemp": str(float(data['air_temperature']) + 10),
+            "airTemp": data['air_temperature'],
+            "humidity": str(round(50 + (float(data['air_temperature']) / 100 * 30), 1)),
+            "windSpeed": data['wind_speed'],
+            "windDirection": data['wind_direction'],
+            "rainfall": data['rainfall'],
+            "compound": data['compound'],
+            "predictedLapTime": str(base_lap_time)
+        }
+
+        # Return a formatted response with team predictions and race conditions.
+        return {
+            "teams": teams,
+            "raceConditions": race_conditions,
+            "trackName": "F1 Comparator"
+        }
+
+    def _get_team_predictions(self, base_performance, conditions):
+        """
+        Calculate team performance predictions based on base performance and additional CSV metrics.
+
+        Args:
+            base_performance (float): The base performance score computed from lap time.
+            conditions (dict): Input conditions used for further performance adjustments.
+
+        Returns:
+            list: A sorted list of team dictionaries with their performance scores.
+        """
+        with self.timer.stage("csv_load"):
+            team_metrics = self._load_team_metrics()
+        if team_metrics is None:
             return []  # Return empty list if data can't be loaded
 
         teams = []
-        # Process each team's data and compute performance adjustments.
-        for team_data in team_base_data:
-            csv_team_name = team_name_map.get(team_data["name"], team_data["name"])
-
-            # Retrieve modifiers from the CSV data.
-            base_modifier = self._get_base_modifier(diff_df, csv_team_name)
-            power_unit = self._get_power_score(speed_df, csv_team_name, min_speed, speed_range)
-            wet_performance = self._get_wet_score(wet_df, csv_team_name, min_wet_speed, wet_range)
-
-            # Build team dictionary with base and CSV-derived metrics.
-            team = {
-                **team_data,
-                "baseModifier": base_modifier,
-                "powerUnit": power_unit,
-                "wetPerformance": wet_performance
-            }
+        with self.timer.stage("team_modifiers"):
+            # Combine each team's precomputed CSV metrics with the current race conditions.
+            for team_data in TEAM_BASE_DATA:
+                # Build team dictionary with base and CSV-derived metrics.
+                team = {
+                    **team_data,
+                    **team_metrics["teams"][team_data["name"]]
+                }
+
+                # Calculate additional performance modifier based on race conditions.
+                performanceModifier = self._calculate_performance_modifier(team, conditions)
+                team["finalPerformance"] = round(base_performance * team["baseModifier"] + performanceModifier, 1)
+                teams.append(team)
+
+        with self.timer.stage("ranking"):
+            # Sort teams based on final performance score in descending order.
+            teams.sort(key=lambda x: x["finalPerformance"], reverse=True)
+
+            # Calculate advantage compared to the top performing team.
+            topPerformance = teams[0]["finalPerformance"]
+            for team in teams:
+                if team["finalPerformance"] == topPerformance:
+                    team["advantage"] = "BASELINE"
+                else:
+                    team["advantage"] = f"{round(team['finalPerformance'] - topPerformance, 1)}%"
+
+        return teams
 
-            # Calculate additional performance modifier based on race conditions.
-            performanceModifier = self._calculate_performance_modifier(team, conditions)
-            team["finalPerformance"] = round(base_performance * team["baseModifier"] + performanceModifier, 1)
-            teams.append(team)
+    def _data_version(self):
+        """
+        Return the version of the data predictions depend on: the model file and the metrics CSVs.
+        Reloads the model first if its pickle was replaced.
+        """
+        return (self.model.reload_if_changed(),) + self._metrics_mtimes()
 
-        # Sort teams based on final performance score in descending order.
-        teams.sort(key=lambda x: x["finalPerformance"], reverse=True)
+    def _metrics_mtimes(self):
+        """
+        Return the modification times of the performance metrics CSV files (None for missing files).
+        """
+        mtimes = []
+        for path in (self.differences_path, self.speed_path, self.wet_path):
+            try:
+                mtimes.append(os.path.getmtime(path))
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def _load_team_metrics(self):
+        """
+        Return the CSV-derived metrics of every team, reading the CSV files only when they changed.
 
-        # Calculate advantage compared to the top performing team.
-        topPerformance = teams[0]["finalPerformance"]
-        for team in teams:
-            if team["finalPerformance"] == topPerformance:
-                team["advantage"] = "BASELINE"
-            else:
-                team["advantage"] = f"{round(team['finalPerformance'] - topPerformance, 1)}%"
+        The base modifier, power unit score and wet performance score of a team depend only on the
+        performance metrics CSVs, so they are computed once per file version and cached together with
+        the speed ranges used for normalisation.
 
-        return teams
+        Returns:
+            dict: {"teams": {team name: {"baseModifier", "powerUnit", "wetPerformance"}},
+                   "min_speed", "speed_range", "min_wet_speed", "wet_range"}, or None if loading failed.
+        """
+        mtimes = self._metrics_mtimes()
+        with self._metrics_lock:
+            if self._team_metrics is not None and mtimes == self._team_metrics_mtimes:
+                return self._team_metrics
+
+            try:
+                # Load performance metrics CSVs.
+                diff_df = pd.read_csv(self.differences_path)
+                diff_df.columns = [col.strip() for col in diff_df.columns]
+
+                speed_df = pd.read_csv(self.speed_path)
+                speed_df.columns = [col.strip() for col in speed_df.columns]
+
+                wet_df = pd.read_csv(self.wet_path)
+                wet_df.columns = [col.strip() for col in wet_df.columns]
+
+                # Calculate speed ranges for normalization.
+                max_speed = speed_df['Average Max Speed'].max()
+                min_speed = speed_df['Average Max Speed'].min()
+                speed_range = max_speed - min_speed
+
+                max_wet_speed = wet_df['Average Wet Max Speed'].max()
+                min_wet_speed = wet_df['Average Wet Max Speed'].min()
+                wet_range = max_wet_speed - min_wet_speed
+
+                # Export the speed ranges used for normalisation.
+                self.timer.set_gauge("speed_range_kmh", min_speed, bound="min", surface="dry")
+                self.timer.set_gauge("speed_range_kmh", max_speed, bound="max", surface="dry")
+                self.timer.set_gauge("speed_range_kmh", min_wet_speed, bound="min", surface="wet")
+                self.timer.set_gauge("speed_range_kmh", max_wet_speed, bound="max", surface="wet")
+
+            except Exception as e:
+                print(f"Error loading CSV data: {e}")
+                return None
+
+            teams = {}
+            for team_data in TEAM_BASE_DATA:
+                csv_team_name = TEAM_NAME_MAP.get(team_data["name"], team_data["name"])
+                # Retrieve modifiers from the CSV data.
+                teams[team_data["name"]] = {
+                    "baseModifier": self._get_base_modifier(diff_df, csv_team_name),
+                    "powerUnit": self._get_power_score(speed_df, csv_team_name, min_speed, speed_range),
+                    "wetPerformance": self._get_wet_score(wet_df, csv_team_name, min_wet_speed, wet_range),
+                }
+
+            self._team_metrics = {
+                "teams": teams,
+                "min_speed": min_speed,
+                "speed_range": speed_range,
+                "min_wet_speed": min_wet_speed,
+                "wet_range": wet_range,
+            }
+            self._team_metrics_mtimes = mtimes
+            return self._team_metrics
 
     def _calculate_performance_modifier(self, team, conditions):
         """
@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# Numeric input fields that can be quantised before prediction.
+FLOAT_FIELDS = ('st_speed', 'air_temperature', 'rainfall', 'wind_direction', 'wind_speed')
+# Default number of cached predictions.
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of prediction results keyed on the normalised input conditions.
+
+    The key is the tuple of numeric inputs (converted to float and optionally snapped to a grid)
+    plus the tire compound, so "28", 28 and 28.0 share one entry. A quantisation step of 0 keeps
+    the exact value. Entries are tagged with a data version (model and metrics file mtimes); when
+    the version changes the whole cache is dropped.
+
+    Attributes:
+        max_entries (int): Maximum number of cached results (0 disables the cache).
+        quantization (dict): Quantisation step per numeric field.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that were not in the cache.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, quantization=None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of cached results (0 disables the cache).
+            quantization (dict): Quantisation step per numeric field, e.g. {"air_temperature": 0.5}.
+                                 Missing fields are not quantised.
+        """
+        self.max_entries = max_entries
+        self.quantization = {field: float((quantization or {}).get(field, 0) or 0) for field in FLOAT_FIELDS}
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config_path):
+        """
+        Create a cache from the "prediction_cache" section of config.json.
+        Missing files or settings fall back to the defaults (exact keys, DEFAULT_MAX_ENTRIES entries).
+
+        Args:
+            config_path (str): Path to the website config.json.
+
+        Returns:
+            PredictionCache: The configured cache.
+        """
+        settings = {}
+        if os.path.exists(config_path):
+            with open(config_path, "r") as f:
+                settings = json.load(f).get("prediction_cache", {})
+        return cls(max_entries=settings.get("max_entries", DEFAULT_MAX_ENTRIES),
+                   quantization=settings.get("quantization"))
+
+    def quantize(self, data):
+        """
+        Return a copy of the input conditions with the numeric fields converted to float and
+        snapped to their quantisation grid.
+
+        Args:
+            data (dict): Input conditions of a prediction request.
+
+        Returns:
+            dict: Normalised conditions.
+
+        Raises:
+            ValueError: If a numeric field cannot be converted to float.
+        """
+        normalised = dict(data)
+        for field in FLOAT_FIELDS:
+            value = float(data[field])
+            step = self.quantization[field]
+            if step > 0:
+                # Round away the floating point noise left by the multiplication.
+                value = round(round(value / step) * step, 9)
+            normalised[field] = value
+        return normalised
+
+    @staticmethod
+    def make_key(normalised):
+        """
+        Build the cache key for already normalised conditions.
+        """
+        return tuple(normalised[field] for field in FLOAT_FIELDS) + (normalised['compound'],)
+
+    def get(self, key, version):
+        """
+        Look up a cached result.
+
+        Args:
+            key (tuple): Key returned by make_key().
+            version: Current data version; a different version than the cached one clears the cache.
+
+        Returns:
+            The cached result, or None if it is not cached.
+        """
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, version, result):
+        """
+        Store a result, evicting the least recently used entries above max_entries.
+        Results computed for an outdated data version are not stored.
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """
+        Return the cache counters for the health endpoint.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxEntries": self.max_entries,
+            }
@@ -0,0 +1,161 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+# Upper bounds (seconds) of the stage duration histogram buckets.
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+METRIC_PREFIX = "omega"
+
+
+def _escape_label(value):
+    """
+    Escape a label value for the Prometheus text format.
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _NullStage:
+    """
+    Context manager returned by a disabled StageTimer: entering and leaving it does nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """
+    Context manager timing one execution of a stage.
+    """
+
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class StageTimer:
+    """
+    Records how long each stage of a request takes into fixed-bucket histograms and renders them,
+    together with a few gauges, in the Prometheus text exposition format.
+
+    Usage:
+        with timer.stage("model_predict"):
+            ...
+
+    When disabled, stage() returns a shared no-op context manager, so instrumented code pays one
+    attribute check per stage. Metrics are kept per process; with several server workers each
+    worker reports its own numbers.
+
+    Attributes:
+        enabled (bool): Whether stage durations are recorded.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        # Per stage: [non-cumulative bucket counts (+Inf last), sum of durations, count].
+        self._histograms = {}
+        # Gauges keyed by (name, sorted label items).
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config_path):
+        """
+        Create a timer from the "metrics" section of config.json ({"enabled": bool}).
+        Timing is disabled when the file or the setting is missing.
+        """
+        settings = {}
+        if os.path.exists(config_path):
+            with open(config_path, "r") as f:
+                settings = json.load(f).get("metrics", {})
+        return cls(enabled=bool(settings.get("enabled", False)))
+
+    def stage(self, name):
+        """
+        Return a context manager that records the duration of the enclosed block under name.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def observe(self, name, seconds):
+        """
+        Record one duration (in seconds) for a stage.
+        """
+        index = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    def set_gauge(self, name, value, **labels):
+        """
+        Set a gauge exported with the stage histograms, e.g. set_gauge("metrics_file_present", 1, file="x.csv").
+        Gauges are kept even when stage timing is disabled.
+        """
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def render(self, extra_counters=None):
+        """
+        Render all histograms and gauges in the Prometheus text format.
+
+        Args:
+            extra_counters (dict): Additional counters to export, {name: value}.
+
+        Returns:
+            str: The metrics page.
+        """
+        with self._lock:
+            histograms = {name: (list(buckets), total, count)
+                          for name, (buckets, total, count) in self._histograms.items()}
+            gauges = dict(self._gauges)
+
+        lines = [
+            f"# HELP {METRIC_PREFIX}_stage_duration_seconds Time spent in each stage of a request.",
+            f"# TYPE {METRIC_PREFIX}_stage_duration_seconds histogram",
+        ]
+        for name in sorted(histograms):
+            buckets, total, count = histograms[name]
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + ("+Inf",), buckets):
+                cumulative += bucket_count
+                lines.append(f'{METRIC_PREFIX}_stage_duration_seconds_bucket{{stage="{name}",le="{bound}"}} '
+                             f'{cumulative}')
+            lines.append(f'{METRIC_PREFIX}_stage_duration_seconds_sum{{stage="{name}"}} {total!r}')
+            lines.append(f'{METRIC_PREFIX}_stage_duration_seconds_count{{stage="{name}"}} {count}')
+
+        for name, value in sorted((extra_counters or {}).items()):
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} counter")
+            lines.append(f"{METRIC_PREFIX}_{name} {value}")
+
+        typed = set()
+        for (name, labels), value in sorted(gauges.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {METRIC_PREFIX}_{name} gauge")
+                typed.add(name)
+            label_text = ",".join(f'{key}="{_escape_label(label)}"' for key, label in labels)
+            lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {value}" if label_text
+                         else f"{METRIC_PREFIX}_{name} {value}")
+        return "\n".join(lines) + "\n"
@@ -1,5 +1,7 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
+from werkzeug.routing import PathConverter
+import gzip
 import sys
 import os
 
@@ -7,11 +9,30 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from ..controllers.predict_controller import PredictController
 
+
+class FrontendPathConverter(PathConverter):
+    """Path converter that does not match API paths, so routing answers them with 404 or 405"""
+    regex = r'(?!api/)[^/].*?'
+
+
 app = Flask(__name__)
+app.url_map.converters['frontend_path'] = FrontendPathConverter
 CORS(app)
 
 predict_controller = PredictController()
 
+# Frontend files, served by this app in production mode (see run_app.py).
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'frontend')
+# Static responses with these mimetypes are gzip-compressed when the client accepts it.
+COMPRESSIBLE_MIMETYPES = {'text/html', 'text/css', 'text/javascript', 'application/javascript',
+                          'application/json', 'image/svg+xml'}
+# Smaller files are not worth compressing.
+GZIP_MIN_SIZE = 500
+# Compressed static files keyed by request path: {path: (ETag, gzip body)}. Each file version is
+# compressed only once, and a changed file replaces its old entry, so the cache never holds more
+# than one body per frontend file.
+_gzip_cache = {}
+
 
 @app.route('/api/predict', methods=['POST'])
 def predict():
@@ -20,15 +41,107 @@ def predict():
         return jsonify({"error": "Request must be JSON"}), 400
 
     data = request.get_json()
-    result, status_code = predict_controller.predict_performance(data)
+    with predict_controller.timer.stage("predict_total"):
+        result, status_code = predict_controller.predict_performance(data)
+
+    with predict_controller.timer.stage("jsonify"):
+        response = jsonify(result)
+    return response, status_code
+
+
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """API endpoint to predict team rankings for many scenarios in one request"""
+    if not request.is_json:
+        return jsonify({"error": "Request must be JSON"}), 400
+
+    data = request.get_json()
+    # Accept either a bare list of scenarios or {"scenarios": [...]}.
+    scenarios = data.get("scenarios") if isinstance(data, dict) else data
+    result, status_code = predict_controller.predict_batch_performance(scenarios)
 
     return jsonify(result), status_code
 
 
+@app.route('/api/predict/grid', methods=['POST'])
+def predict_grid():
+    """API endpoint returning team performance over a grid of conditions as a NumPy .npz archive"""
+    if not request.is_json:
+        return jsonify({"error": "Request must be JSON"}), 400
+
+    result, status_code = predict_controller.predict_grid(request.get_json())
+    if status_code != 200:
+        return jsonify(result), status_code
+
+    return Response(result, mimetype='application/octet-stream',
+                    headers={'Content-Disposition': 'attachment; filename=prediction_grid.npz'})
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "ok", "message": "API is running"}), 200
+    return jsonify({
+        "status": "ok",
+        "message": "API is running",
+        "predictionCache": predict_controller.prediction_cache.stats()
+    }), 200
+
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Stage timings and cache counters in the Prometheus text format"""
+    cache_stats = predict_controller.prediction_cache.stats()
+    page = predict_controller.timer.render({
+        "prediction_cache_hits_total": cache_stats["hits"],
+        "prediction_cache_misses_total": cache_stats["misses"],
+    })
+    return Response(page, mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/', methods=['GET'])
+def index():
+    """Serve the frontend page"""
+    return send_from_directory(os.path.join(FRONTEND_DIR, 'html'), 'index.html')
+
+
+@app.route('/<frontend_path:filename>', methods=['GET'])
+def frontend_file(filename):
+    """Serve frontend static files with ETag and Last-Modified headers"""
+    return send_from_directory(FRONTEND_DIR, filename)
+
+
+@app.after_request
+def compress_static(response):
+    """Gzip static frontend files for clients that accept it"""
+    if (response.status_code != 200
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'gzip' not in request.headers.get('Accept-Encoding', '')
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    etag, weak = response.get_etag()
+    if etag is None:
+        # Only static files carry an ETag; API responses are left unchanged.
+        return response
+
+    cached_etag, compressed = _gzip_cache.get(request.path, (None, None))
+    if cached_etag != etag:
+        response.direct_passthrough = False
+        data = response.get_data()
+        if len(data) < GZIP_MIN_SIZE:
+            return response
+        compressed = gzip.compress(data, compresslevel=6)
+        _gzip_cache[request.path] = (etag, compressed)
+
+    response.direct_passthrough = False
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    # Byte ranges of the file do not apply to the compressed body.
+    response.headers.pop('Accept-Ranges', None)
+    # The compressed body differs byte-wise from the file, so its ETag is only weakly equal.
+    response.set_etag(etag, weak=True)
+    return response
 
 
 if __name__ == '__main__':
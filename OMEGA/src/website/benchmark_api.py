@@ -0,0 +1,294 @@
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+# Directory of this script and the repository root the backend is imported from.
+website_dir = os.path.abspath(os.path.dirname(__file__))
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(website_dir)))
+HISTORY_FILE = os.path.join(website_dir, "benchmark_history.json")
+COMPOUNDS = ["Soft", "Medium", "Hard", "Intermediate", "Wet"]
+# Lines of the stage duration histograms on /api/metrics.
+STAGE_METRIC = re.compile(r'^omega_stage_duration_seconds_(bucket|sum|count)'
+                          r'\{stage="([^"]+)"(?:,le="([^"]+)")?\} (\S+)$')
+
+
+def build_scenarios(count, seed=0):
+    """
+    Build a pool of distinct /api/predict request bodies. The pool size controls how often
+    the prediction cache can answer a request.
+    """
+    rnd = random.Random(seed)
+    return [{
+        "st_speed": round(rnd.uniform(280, 345), 1),
+        "compound": rnd.choice(COMPOUNDS),
+        "air_temperature": round(rnd.uniform(5, 40), 1),
+        "rainfall": rnd.choice([0, 0, 0, 1]),
+        "wind_direction": rnd.randrange(0, 360),
+        "wind_speed": round(rnd.uniform(0, 10), 1),
+    } for _ in range(count)]
+
+
+def parse_mix(mix):
+    """
+    Parse a request mix such as "predict=9,health=1" into a list of (endpoint, weight).
+    """
+    weights = []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("predict", "health"):
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+        weights.append((name, float(weight or 1)))
+    return weights
+
+
+def percentile(sorted_values, fraction):
+    """
+    Return the value at the given fraction of an already sorted list (nearest rank).
+    """
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(durations):
+    """
+    Summarize durations in seconds as milliseconds: count, mean, p50, p95 and p99.
+    """
+    values = sorted(durations)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values) * 1000, 3),
+        "p50": round(percentile(values, 0.50) * 1000, 3),
+        "p95": round(percentile(values, 0.95) * 1000, 3),
+        "p99": round(percentile(values, 0.99) * 1000, 3),
+    }
+
+
+def parse_stage_metrics(text):
+    """
+    Parse the stage histograms of an /api/metrics page.
+
+    Returns:
+        dict: {stage: {"buckets": {upper bound: cumulative count}, "sum": seconds, "count": n}}
+    """
+    stages = {}
+    for line in text.splitlines():
+        match = STAGE_METRIC.match(line)
+        if not match:
+            continue
+        kind, stage, bound, value = match.groups()
+        entry = stages.setdefault(stage, {"buckets": {}, "sum": 0.0, "count": 0})
+        if kind == "bucket":
+            entry["buckets"][float(bound)] = int(value)
+        elif kind == "sum":
+            entry["sum"] = float(value)
+        else:
+            entry["count"] = int(value)
+    return stages
+
+
+def summarize_stages(before, after):
+    """
+    Summarize the stage histograms recorded between two /api/metrics snapshots, in milliseconds.
+    Percentiles are the upper bound of the histogram bucket they fall into, or None if they fall
+    into the +Inf bucket, which has no upper bound.
+    """
+    summary = {}
+    for stage, entry in after.items():
+        previous = before.get(stage, {"buckets": {}, "sum": 0.0, "count": 0})
+        count = entry["count"] - previous["count"]
+        if count <= 0:
+            continue
+        buckets = sorted((bound, cumulative - previous["buckets"].get(bound, 0))
+                         for bound, cumulative in entry["buckets"].items())
+
+        def bucket_percentile(fraction):
+            for bound, cumulative in buckets:
+                if cumulative >= fraction * count:
+                    return bound * 1000 if bound != float("inf") else None
+            return None
+
+        summary[stage] = {
+            "count": count,
+            "mean": round((entry["sum"] - previous["sum"]) / count * 1000, 3),
+            "p50": bucket_percentile(0.50),
+            "p95": bucket_percentile(0.95),
+            "p99": bucket_percentile(0.99),
+        }
+    return summary
+
+
+def format_bound(value):
+    """
+    Format a bucket percentile from summarize_stages() for printing.
+    """
+    return f"<={value:g} ms" if value is not None else " above the largest bucket"
+
+
+def make_client(url):
+    """
+    Return a function sending (method, path, body) and returning (HTTP status code, response text).
+    Without a URL the Flask app is imported and driven through its test client.
+    """
+    if url:
+        def send(method, path, body=None):
+            data = json.dumps(body).encode() if body is not None else None
+            req = urllib.request.Request(url.rstrip("/") + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+            try:
+                with urllib.request.urlopen(req) as response:
+                    return response.status, response.read().decode()
+            except urllib.error.HTTPError as e:
+                return e.code, e.read().decode()
+        return send
+
+    from OMEGA.src.website.backend.views.app import app
+    local = threading.local()
+
+    def send(method, path, body=None):
+        # One test client per thread.
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        if method == "POST":
+            response = local.client.post(path, json=body)
+        else:
+            response = local.client.get(path)
+        return response.status_code, response.get_data(as_text=True)
+    return send
+
+
+def run_benchmark(send, requests_total, concurrency, mix, scenarios, seed=0):
+    """
+    Send requests_total requests from concurrency threads and collect per-endpoint latencies.
+
+    Returns:
+        tuple: (wall time in seconds, {endpoint: [durations]}, number of failed requests)
+    """
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    rnd = random.Random(seed)
+    plan = [(rnd.choices(names, weights)[0], rnd.choice(scenarios)) for _ in range(requests_total)]
+
+    durations = {name: [] for name in names}
+    errors = [0]
+    lock = threading.Lock()
+    next_index = [0]
+
+    def worker():
+        while True:
+            with lock:
+                if next_index[0] >= len(plan):
+                    return
+                endpoint, scenario = plan[next_index[0]]
+                next_index[0] += 1
+            start = time.perf_counter()
+            if endpoint == "predict":
+                status, _ = send("POST", "/api/predict", scenario)
+            else:
+                status, _ = send("GET", "/api/health")
+            elapsed = time.perf_counter() - start
+            with lock:
+                durations[endpoint].append(elapsed)
+                if status != 200:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, durations, errors[0]
+
+
+def git_commit():
+    """
+    Return the current git commit hash, or None outside a git checkout.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=website_dir,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def append_history(result, history_file):
+    """
+    Append a benchmark result to the JSON history file.
+    """
+    history = []
+    if os.path.exists(history_file):
+        with open(history_file, "r") as f:
+            history = json.load(f)
+    history.append(result)
+    with open(history_file, "w") as f:
+        # Infinity and NaN are not valid JSON; fail instead of writing a history other tools cannot read.
+        json.dump(history, f, indent=2, allow_nan=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test /api/predict and /api/health.")
+    parser.add_argument("--url", help="base URL of a running server (default: in-process Flask test client)")
+    parser.add_argument("--requests", type=int, default=2000, help="total number of requests")
+    parser.add_argument("--concurrency", type=int, default=4, help="number of client threads")
+    parser.add_argument("--mix", default="predict=9,health=1", help="request mix, e.g. predict=9,health=1")
+    parser.add_argument("--distinct", type=int, default=200, help="number of distinct prediction inputs")
+    parser.add_argument("--warmup", type=int, default=50, help="requests sent before measuring")
+    parser.add_argument("--history", default=HISTORY_FILE, help="JSON file the results are appended to")
+    parser.add_argument("--no-history", action="store_true", help="do not write the results")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, repo_root)
+    mix = parse_mix(args.mix)
+    scenarios = build_scenarios(args.distinct)
+    send = make_client(args.url)
+
+    run_benchmark(send, args.warmup, 1, mix, scenarios, seed=1)
+    # Stage timings come from the server's /api/metrics histograms (enable "metrics" in config.json).
+    # A multi-worker server answers from one worker, so remote stage numbers cover that worker only.
+    before = parse_stage_metrics(send("GET", "/api/metrics")[1])
+    wall_time, durations, errors = run_benchmark(send, args.requests, args.concurrency, mix, scenarios)
+    stages = summarize_stages(before, parse_stage_metrics(send("GET", "/api/metrics")[1]))
+
+    result = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "target": args.url or "test-client",
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "mix": args.mix,
+        "distinct_inputs": args.distinct,
+        "errors": errors,
+        "throughput_rps": round(args.requests / wall_time, 1),
+        "latency_ms": {endpoint: summarize(values) for endpoint, values in durations.items()},
+        "stages_ms": stages or None,
+    }
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {errors} errors, "
+          f"{result['throughput_rps']} req/s")
+    for endpoint, stats in result["latency_ms"].items():
+        if stats["count"]:
+            print(f"  {endpoint:14} n={stats['count']:<6} p50={stats['p50']:.3f} ms  "
+                  f"p95={stats['p95']:.3f} ms  p99={stats['p99']:.3f} ms")
+    for stage, stats in sorted((result["stages_ms"] or {}).items()):
+        print(f"  stage {stage:19} n={stats['count']:<6} mean={stats['mean']:.3f} ms  "
+              f"p50{format_bound(stats['p50'])}  p95{format_bound(stats['p95'])}  p99{format_bound(stats['p99'])}")
+
+    if not args.no_history:
+        append_history(result, args.history)
+        print(f"Results appended to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,9 @@
+// The development frontend server (port 8000) talks to the Flask dev server; in production mode
+// the page and the API come from the same server, so a relative URL is used.
+const API_BASE = (window.location.protocol === 'file:' || window.location.port === '8000')
+  ? 'http://127.0.0.1:5000'
+  : '';
+
 document.getElementById('racePredictionForm').addEventListener('submit', function(e) {
   e.preventDefault();
 
@@ -23,7 +29,7 @@ document.getElementById('racePredictionForm').addEventListener('submit', functio
   };
 
   // Make actual API call to backend
-  fetch('http://127.0.0.1:5000/api/predict', {
+  fetch(`${API_BASE}/api/predict`, {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
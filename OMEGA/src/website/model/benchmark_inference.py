@@ -0,0 +1,69 @@
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+
+from flat_forest import FlatForest
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'random_forest_model.pkl')
+SINGLE_ROW_REPEATS = 200
+BATCH_ROWS = 10000
+TOLERANCE = 1e-9
+
+
+def random_features(n_rows, seed=0):
+    """
+    Build a feature matrix in the model's 12-column layout with realistic value ranges.
+    """
+    rng = np.random.default_rng(seed)
+    X = np.zeros((n_rows, 12))
+    X[:, 0] = rng.uniform(250, 345, n_rows)  # st_speed
+    X[:, 4] = rng.uniform(5, 40, n_rows)  # air_temperature
+    X[:, 5] = rng.integers(0, 2, n_rows)  # rainfall
+    X[:, 6] = rng.uniform(0, 360, n_rows)  # wind_direction
+    X[:, 7] = rng.uniform(0, 10, n_rows)  # wind_speed
+    X[np.arange(n_rows), 8 + rng.integers(0, 4, n_rows)] = 1.0  # compound one-hot
+    return X
+
+
+def time_call(function, repeats):
+    """
+    Return the median wall time of function() in seconds over the given number of calls.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main(model_path=MODEL_PATH):
+    with open(model_path, 'rb') as f:
+        estimator = pickle.load(f)
+    forest = FlatForest.from_estimator(estimator)
+    print(f"Model: {len(forest.roots)} trees, {len(forest.value)} nodes, max depth {forest.max_depth}")
+
+    X = random_features(BATCH_ROWS)
+    max_difference = np.abs(forest.predict(X) - estimator.predict(X)).max()
+    if max_difference > TOLERANCE:
+        raise SystemExit(f"Predictions differ from scikit-learn by {max_difference:.3g}!")
+    print(f"Max difference to scikit-learn over {BATCH_ROWS} rows: {max_difference:.3g}")
+
+    row = X[:1]
+    sklearn_single = time_call(lambda: estimator.predict(row), SINGLE_ROW_REPEATS)
+    flat_single = time_call(lambda: forest.predict(row), SINGLE_ROW_REPEATS)
+    sklearn_batch = time_call(lambda: estimator.predict(X), 5)
+    flat_batch = time_call(lambda: forest.predict(X), 5)
+
+    print(f"{'':12}{'scikit-learn':>16}{'flat NumPy':>16}{'speedup':>10}")
+    print(f"{'1 row':12}{sklearn_single * 1e3:>13.3f} ms{flat_single * 1e3:>13.3f} ms"
+          f"{sklearn_single / flat_single:>9.1f}x")
+    print(f"{f'{BATCH_ROWS} rows':12}{sklearn_batch * 1e3:>13.3f} ms{flat_batch * 1e3:>13.3f} ms"
+          f"{sklearn_batch / flat_batch:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
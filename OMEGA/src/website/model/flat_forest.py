@@ -0,0 +1,274 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+
+import numpy as np
+
+# Version of the on-disk layout written by FlatForest.save().
+FORMAT_VERSION = 1
+# Arrays stored as one .npy file each in the export directory.
+ARRAY_NAMES = ('feature', 'threshold', 'left', 'right', 'value', 'roots')
+META_NAME = 'meta.json'
+# Rows evaluated together by FlatForest.predict(); bounds the size of the (row, tree) working set.
+PREDICT_CHUNK_ROWS = 1024
+
+
+def file_sha256(path):
+    """
+    Return the SHA-256 hex digest of a file's content.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def describe_source(path, sha256=None):
+    """
+    Describe the pickle an export is made from: its size, modification time and SHA-256.
+
+    Args:
+        path (str): Path of the pickle.
+        sha256 (str): Already computed SHA-256 of the file (computed when omitted).
+
+    Returns:
+        dict: {"size", "mtime_ns", "sha256"}, stored as "source" in the export's meta.json.
+    """
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256 or file_sha256(path)}
+
+
+def source_unchanged(source, path):
+    """
+    Check cheaply whether a file still has the size and modification time recorded by describe_source().
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return bool(source) and source.get("size") == stat.st_size and source.get("mtime_ns") == stat.st_mtime_ns
+
+
+class FlatForest:
+    """
+    Random forest regressor flattened into contiguous NumPy arrays.
+
+    All trees share one set of node arrays. A node's children are global indices into these
+    arrays and leaves point to themselves, so walking a tree is the same loop for every node.
+    The export directory holds one .npy file per array and is opened with memory mapping: loading
+    is nearly instant and worker processes share the pages through the OS page cache instead of
+    each holding an unpickled copy of the forest.
+
+    Prediction follows scikit-learn: inputs are cast to float32, a sample goes left when
+    x[feature] <= threshold, and the forest prediction is the mean of the tree predictions.
+
+    Attributes:
+        feature (numpy.ndarray): Feature index tested by each node (0 for leaves).
+        threshold (numpy.ndarray): Split threshold of each node (+inf for leaves).
+        left (numpy.ndarray): Global index of the left child (the node itself for leaves).
+        right (numpy.ndarray): Global index of the right child (the node itself for leaves).
+        value (numpy.ndarray): Prediction stored in each node.
+        roots (numpy.ndarray): Global index of the root node of each tree.
+        n_features (int): Number of input features.
+        max_depth (int): Depth of the deepest tree.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, n_features, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.n_features = n_features
+        self.max_depth = max_depth
+
+    @classmethod
+    def from_estimator(cls, estimator):
+        """
+        Flatten a fitted scikit-learn RandomForestRegressor (or a single DecisionTreeRegressor).
+
+        Args:
+            estimator: Fitted single-output regression forest or tree.
+
+        Returns:
+            FlatForest: The flattened forest.
+        """
+        trees = [tree.tree_ for tree in getattr(estimator, 'estimators_', [estimator])]
+        if any(tree.n_outputs != 1 for tree in trees):
+            raise ValueError("Only single-output regression trees can be flattened")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.array(roots, dtype=np.int32),
+            n_features=int(estimator.n_features_in_),
+            max_depth=max(int(tree.max_depth) for tree in trees),
+        )
+
+    def save(self, directory, source=None):
+        """
+        Write the forest to a directory of .npy files, replacing any previous export.
+
+        Args:
+            directory (str): Export directory.
+            source (dict): Description of the pickle the forest was exported from (see describe_source()).
+                           The loader uses it to detect an export that does not match the pickle.
+        """
+        # One temporary directory per process, so workers rebuilding the export at once do not collide.
+        tmp_dir = f"{directory}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        try:
+            for name in ARRAY_NAMES:
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+            self.write_meta(tmp_dir, {
+                "format": FORMAT_VERSION,
+                "n_trees": int(len(self.roots)),
+                "n_nodes": int(len(self.value)),
+                "n_features": self.n_features,
+                "max_depth": self.max_depth,
+                "source": source,
+            })
+            # Processes that still map the old files keep their pages until they reload.
+            shutil.rmtree(directory, ignore_errors=True)
+            os.replace(tmp_dir, directory)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    @staticmethod
+    def write_meta(directory, meta):
+        """
+        Atomically write the metadata of an export directory.
+        """
+        tmp_path = os.path.join(directory, f"{META_NAME}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(directory, META_NAME))
+
+    @staticmethod
+    def read_meta(directory):
+        """
+        Read the metadata of an export directory, or return None if there is no valid export.
+        """
+        try:
+            with open(os.path.join(directory, META_NAME), "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("format") == FORMAT_VERSION else None
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Open an export directory written by save().
+
+        Args:
+            directory (str): Export directory.
+            mmap (bool): Memory-map the arrays read-only instead of reading them into memory.
+
+        Returns:
+            FlatForest: The loaded forest.
+        """
+        meta = cls.read_meta(directory)
+        if meta is None:
+            raise ValueError(f"No flat forest export in {directory}")
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r' if mmap else None)
+                  for name in ARRAY_NAMES}
+        return cls(n_features=meta["n_features"], max_depth=meta["max_depth"], **arrays)
+
+    def predict(self, X):
+        """
+        Predict target values for the rows of X.
+
+        All (row, tree) pairs of a chunk of rows are advanced one tree level per step with array
+        indexing. Pairs that reached a leaf are dropped from the working set, so each step only
+        touches the paths that are still descending. Chunks are kept small enough for the working
+        set to stay in cache.
+
+        Args:
+            X (array-like): Matrix of shape (n_samples, n_features).
+
+        Returns:
+            numpy.ndarray: Predictions of shape (n_samples,).
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected input of shape (n_samples, {self.n_features}), got {X.shape}")
+
+        predictions = np.empty(len(X))
+        for start in range(0, len(X), PREDICT_CHUNK_ROWS):
+            predictions[start:start + PREDICT_CHUNK_ROWS] = self._predict_chunk(X[start:start + PREDICT_CHUNK_ROWS])
+        return predictions
+
+    def _predict_chunk(self, X):
+        """
+        Predict one chunk of float32 rows; see predict().
+        """
+        n_rows, n_trees = len(X), len(self.roots)
+        flat_X = X.ravel()
+        # Final node of every (row, tree) pair, flattened row-major.
+        nodes = np.tile(np.asarray(self.roots, dtype=np.intp), n_rows)
+
+        # Working set of the pairs still descending: their position in nodes, their current node
+        # and the offset of their row in flat_X (so X[row, feature] is a single take()).
+        positions = np.arange(len(nodes))
+        current = nodes.copy()
+        row_offsets = np.repeat(np.arange(n_rows, dtype=np.intp) * self.n_features, n_trees)
+        for _ in range(self.max_depth):
+            if not len(current):
+                break
+            goes_left = flat_X.take(row_offsets + self.feature.take(current)) <= self.threshold.take(current)
+            current = np.where(goes_left, self.left.take(current), self.right.take(current))
+            # Record the pairs that reached a leaf and drop them from the working set.
+            done = self.left.take(current) == current
+            if done.any():
+                nodes[positions[done]] = current[done]
+                descending = ~done
+                positions = positions[descending]
+                current = current[descending]
+                row_offsets = row_offsets[descending]
+
+        return self.value.take(nodes).reshape(n_rows, n_trees).mean(axis=1)
+
+
+def main(argv=None):
+    """
+    Export a pickled random forest to the flat format next to it.
+
+    Usage: python flat_forest.py [model.pkl] [output_dir]
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    model_path = argv[0] if argv else os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                   'random_forest_model.pkl')
+    output_dir = argv[1] if len(argv) > 1 else os.path.splitext(model_path)[0] + '.flat'
+
+    with open(model_path, 'rb') as f:
+        estimator = pickle.load(f)
+    forest = FlatForest.from_estimator(estimator)
+    forest.save(output_dir, source=describe_source(model_path))
+    print(f"Exported {len(forest.roots)} trees ({len(forest.value)} nodes) to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
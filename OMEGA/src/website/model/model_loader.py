@@ -1,7 +1,21 @@
 import pickle
+import threading
 import numpy as np
 import os
 
+from .flat_forest import FlatForest, META_NAME, describe_source, file_sha256, source_unchanged
+
+# Numeric input fields in the order they appear in the feature matrix.
+NUMERIC_FEATURES = ('st_speed', 'air_temperature', 'rainfall', 'wind_direction', 'wind_speed')
+# Tire compounds in the order of their one-hot columns.
+COMPOUNDS = ('Hard', 'Intermediate', 'Medium', 'Soft')
+# Largest matrix predicted with the flat forest. Its level-by-level walk wins for the small requests
+# of the prediction endpoint but falls behind scikit-learn's compiled tree traversal for large grids,
+# so bigger matrices go to the pickled estimator.
+FLAT_FOREST_MAX_ROWS = 512
+# Lap time returned when the model fails to predict.
+DEFAULT_LAP_TIME = 90.0
+
 
 class F1PredictionModel:
     """
@@ -13,12 +27,115 @@ class F1PredictionModel:
         """
         Initialize the model by loading the pre-trained Random Forest model from disk.
         """
-        # Define the model path relative to this file.
-        model_path = os.path.join(os.path.dirname(__file__), 'random_forest_model.pkl')
-        with open(model_path, 'rb') as file:
-            self.model = pickle.load(file)
+        # Define the model paths relative to this file.
+        self.model_path = os.path.join(os.path.dirname(__file__), 'random_forest_model.pkl')
+        self.flat_path = os.path.join(os.path.dirname(__file__), 'random_forest_model.flat')
+        self.model_mtime = None
+        self._estimator = None
+        self._estimator_lock = threading.Lock()
+        self._load()
+
+    def _source_mtime(self):
+        """
+        Return the modification times of the pickle and of the flat export (None when missing).
+        """
+        mtimes = []
+        for path in (self.model_path, os.path.join(self.flat_path, META_NAME)):
+            try:
+                mtimes.append(os.path.getmtime(path))
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def _load(self):
+        """
+        Load the model and remember the modification times of the files it came from.
 
-    def predict(self, features):
+        The memory-mapped flat export (see flat_forest.py) is preferred because it opens almost
+        instantly and is shared between worker processes. It is used as long as the pickle has the
+        size and modification time recorded in the export. Only when they differ is the pickle
+        hashed: if its content is unchanged the new size and time are recorded, otherwise the
+        export is rebuilt from the pickle. Without a pickle the export cannot be checked and is
+        served as it is.
+        """
+        meta = FlatForest.read_meta(self.flat_path)
+        source = (meta or {}).get("source") or {}
+        self._estimator = None
+        if meta is not None and not os.path.exists(self.model_path):
+            print(f"Model warning: {self.model_path} is missing, serving the unverified flat export")
+            self.model = FlatForest.load(self.flat_path)
+        elif meta is not None and source_unchanged(source, self.model_path):
+            self.model = FlatForest.load(self.flat_path)
+        else:
+            sha256 = file_sha256(self.model_path)
+            if meta is not None and source.get("sha256") == sha256:
+                # Same content under a new time (e.g. copied); record it so the next start skips hashing.
+                FlatForest.write_meta(self.flat_path, {**meta, "source": describe_source(self.model_path, sha256)})
+                self.model = FlatForest.load(self.flat_path)
+            else:
+                print(f"Model warning: flat export {self.flat_path} does not match {self.model_path}, "
+                      f"rebuilding it")
+                with open(self.model_path, 'rb') as file:
+                    self._estimator = pickle.load(file)
+                try:
+                    FlatForest.from_estimator(self._estimator).save(
+                        self.flat_path, source=describe_source(self.model_path, sha256))
+                    self.model = FlatForest.load(self.flat_path)
+                except Exception as e:
+                    print(f"Model export error: {e}")
+                    self.model = self._estimator
+        # Taken after a rebuild, so the new export does not trigger another reload.
+        self.model_mtime = self._source_mtime()
+
+    def load_estimator(self):
+        """
+        Return the scikit-learn estimator, unpickling it if the flat export is being served.
+
+        The production server calls this before forking its workers so they share one copy;
+        otherwise the first large prediction loads it. Concurrent callers load it only once.
+        Without a usable pickle the flat forest is returned instead.
+        """
+        with self._estimator_lock:
+            if self._estimator is None:
+                try:
+                    with open(self.model_path, 'rb') as file:
+                        self._estimator = pickle.load(file)
+                except Exception as e:
+                    print(f"Model load error: {e}")
+                    # Do not retry on every request; the next reload tries again.
+                    self._estimator = self.model
+            return self._estimator
+
+    def _model_for(self, n_rows):
+        """
+        Return the model to predict a matrix of n_rows rows with: the flat forest up to
+        FLAT_FOREST_MAX_ROWS rows, the scikit-learn estimator (see load_estimator()) above.
+        """
+        if n_rows <= FLAT_FOREST_MAX_ROWS:
+            return self.model
+        return self._estimator or self.load_estimator()
+
+    def reload_if_changed(self):
+        """
+        Reload the model if the pickle or the flat export on disk changed since it was loaded.
+
+        Returns:
+            tuple: Modification times of the currently loaded model files.
+        """
+        mtime = self._source_mtime()
+        if mtime == (None, None):
+            # Keep serving the loaded model while the files are missing (e.g. during a replace).
+            return self.model_mtime
+        if mtime != self.model_mtime:
+            try:
+                self._load()
+            except Exception as e:
+                print(f"Model reload error: {e}")
+                # Do not retry the broken files on every request; wait for the next change.
+                self.model_mtime = mtime
+        return self.model_mtime
+
+    def predict(self, features, default=DEFAULT_LAP_TIME):
         """
         Predict the lap time based on input features.
 
@@ -34,31 +151,13 @@ class F1PredictionModel:
 
         Args:
             features (dict): Input features for prediction.
+            default: Returned instead if the prediction fails (None lets callers tell a failure
+                     apart from a prediction).
 
         Returns:
             float: Predicted lap time, rounded to three decimal places.
         """
-        # One-hot encode the tire compound.
-        compound_HARD = 1 if features['compound'] == 'Hard' else 0
-        compound_INTERMEDIATE = 1 if features['compound'] == 'Intermediate' else 0
-        compound_MEDIUM = 1 if features['compound'] == 'Medium' else 0
-        compound_SOFT = 1 if features['compound'] == 'Soft' else 0
-
-        # Build the feature array expected by the ML model.
-        X = np.array([
-            float(features['st_speed']),
-            0.0,  # duration_sector_1 placeholder
-            0.0,  # duration_sector_2 placeholder
-            0.0,  # duration_sector_3 placeholder
-            float(features['air_temperature']),
-            float(features['rainfall']),
-            float(features['wind_direction']),
-            float(features['wind_speed']),
-            compound_HARD,
-            compound_INTERMEDIATE,
-            compound_MEDIUM,
-            compound_SOFT
-        ]).reshape(1, -1)
+        X = self.encode_features([features])
 
         # Make prediction using the loaded ML model.
         try:
@@ -67,4 +166,75 @@ class F1PredictionModel:
         except Exception as e:
             print(f"Prediction error: {e}")
             # Return a default value if prediction fails.
-            return 90.0
+            return default
+
+    @staticmethod
+    def encode_features(features_list):
+        """
+        Build the feature matrix expected by the ML model for a list of feature dictionaries.
+
+        Numeric fields are converted column by column and the tire compound is one-hot encoded
+        for all rows at once.
+
+        Args:
+            features_list (list): Feature dictionaries with the keys described in predict().
+
+        Returns:
+            numpy.ndarray: Matrix of shape (len(features_list), 12).
+        """
+        numeric = np.array([[features[name] for name in NUMERIC_FEATURES] for features in features_list],
+                           dtype=object).reshape(len(features_list), len(NUMERIC_FEATURES)).astype(float)
+        compounds = np.array([features['compound'] for features in features_list], dtype=object)
+        return F1PredictionModel.encode_columns(numeric, compounds)
+
+    @staticmethod
+    def encode_columns(numeric, compounds):
+        """
+        Build the feature matrix from already converted columns.
+
+        Args:
+            numeric (numpy.ndarray): Float matrix of shape (n, 5) with the NUMERIC_FEATURES columns.
+            compounds (numpy.ndarray): Tire compound of each row, shape (n,).
+
+        Returns:
+            numpy.ndarray: Matrix of shape (n, 12).
+        """
+        one_hot = (np.asarray(compounds, dtype=object)[:, None] == np.array(COMPOUNDS, dtype=object)[None, :])
+
+        X = np.zeros((len(numeric), 12))
+        X[:, 0] = numeric[:, 0]  # st_speed
+        # Columns 1-3 are the duration_sector_1..3 placeholders and stay 0.0.
+        X[:, 4:8] = numeric[:, 1:]  # air_temperature, rainfall, wind_direction, wind_speed
+        X[:, 8:12] = one_hot  # compound_HARD, compound_INTERMEDIATE, compound_MEDIUM, compound_SOFT
+        return X
+
+    def predict_matrix(self, X):
+        """
+        Predict lap times for an encoded feature matrix.
+
+        Args:
+            X (numpy.ndarray): Matrix built by encode_features() or encode_columns().
+
+        Returns:
+            numpy.ndarray: Predicted lap times rounded to three decimal places.
+        """
+        try:
+            return np.round(self._model_for(len(X)).predict(X), 3)
+        except Exception as e:
+            print(f"Prediction error: {e}")
+            # Return a default value for every row if prediction fails.
+            return np.full(len(X), DEFAULT_LAP_TIME)
+
+    def predict_batch(self, features_list):
+        """
+        Predict lap times for many feature dictionaries with a single model call.
+
+        Args:
+            features_list (list): Feature dictionaries with the keys described in predict().
+
+        Returns:
+            list: Predicted lap times rounded to three decimal places, in input order.
+        """
+        if not features_list:
+            return []
+        return [float(value) for value in self.predict_matrix(self.encode_features(features_list))]
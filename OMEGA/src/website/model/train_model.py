@@ -0,0 +1,225 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import GridSearchCV, train_test_split
+
+# Make the OMEGA package importable when this file is run as a script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))))
+from OMEGA.src.website.model.flat_forest import FlatForest, describe_source
+from OMEGA.src.website.model.model_loader import F1PredictionModel, NUMERIC_FEATURES
+
+model_dir = os.path.dirname(os.path.abspath(__file__))
+CLEANED_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(model_dir)), 'datascraper', 'data', 'cleaned_data')
+DEFAULT_INPUTS = [os.path.join(CLEANED_DATA_DIR, '*_cleaned.csv')]
+FEATURE_CACHE_DIR = os.path.join(model_dir, 'feature_cache')
+MODEL_PATH = os.path.join(model_dir, 'random_forest_model.pkl')
+# Default output: a candidate next to the served model, so training never replaces it by accident.
+CANDIDATE_PATH = os.path.join(model_dir, 'random_forest_model.candidate.pkl')
+REPORT_PATH = os.path.join(model_dir, 'training_report.json')
+
+# Bump when the feature construction changes, so cached matrices are rebuilt.
+FEATURE_VERSION = 1
+# Cleaned CSV column for each numeric model input.
+CSV_FEATURE_COLUMNS = {
+    'st_speed': 'st_speed',
+    'air_temperature': 'Air Temperature',
+    'rainfall': 'Rainfall',
+    'wind_direction': 'Wind Direction',
+    'wind_speed': 'Wind Speed',
+}
+TARGET_COLUMN = 'Fastest Lap Duration'
+DEFAULT_PARAMS = {'n_estimators': 100, 'random_state': 42}
+PARAM_GRID = {
+    'n_estimators': [100, 200],
+    'max_depth': [None, 12, 20],
+    'min_samples_leaf': [1, 2, 4],
+}
+
+
+def inputs_digest(csv_paths):
+    """
+    Return the SHA-256 over the feature version and the names and contents of the input CSVs.
+    """
+    digest = hashlib.sha256(f"features-v{FEATURE_VERSION}".encode())
+    for path in csv_paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_features(csv_paths):
+    """
+    Build the model inputs from cleaned CSVs.
+
+    The matrix is encoded by F1PredictionModel.encode_columns(), the same code that encodes the
+    website requests, so training and serving see identical layouts: the sector duration columns
+    are left at 0.0 exactly as at prediction time, and compounds are one-hot encoded after
+    converting the CSV spelling ("SOFT") to the request spelling ("Soft"). Rows with a missing
+    target or feature are dropped.
+
+    Returns:
+        tuple: (X of shape (n, 12), y of shape (n,))
+    """
+    frames = [pd.read_csv(path, usecols=list(CSV_FEATURE_COLUMNS.values()) + ['Compound', TARGET_COLUMN])
+              for path in csv_paths]
+    data = pd.concat(frames, ignore_index=True).dropna()
+    numeric = data[[CSV_FEATURE_COLUMNS[name] for name in NUMERIC_FEATURES]].to_numpy(dtype=float)
+    compounds = data['Compound'].astype(str).str.title().to_numpy(dtype=object)
+    X = F1PredictionModel.encode_columns(numeric, compounds)
+    y = data[TARGET_COLUMN].to_numpy(dtype=float)
+    return X, y
+
+
+def load_features(csv_paths, cache_dir=FEATURE_CACHE_DIR):
+    """
+    Return the feature matrix and target for the input CSVs, from the .npy cache when the inputs
+    are unchanged.
+
+    Returns:
+        tuple: (X, y, cache hit)
+    """
+    key = inputs_digest(csv_paths)
+    x_path = os.path.join(cache_dir, f"{key}_X.npy")
+    y_path = os.path.join(cache_dir, f"{key}_y.npy")
+    if os.path.exists(x_path) and os.path.exists(y_path):
+        return np.load(x_path), np.load(y_path), True
+
+    X, y = build_features(csv_paths)
+    os.makedirs(cache_dir, exist_ok=True)
+    for path, array in ((x_path, X), (y_path, y)):
+        tmp_path = f"{path}.tmp.npy"
+        np.save(tmp_path, array)
+        os.replace(tmp_path, path)
+    return X, y, False
+
+
+def fit_model(X, y, grid_search=False, jobs=-1):
+    """
+    Fit the random forest, optionally after a cross-validated grid search.
+
+    The grid search runs its candidate fits in parallel worker processes (each fit single-threaded);
+    the final model is fitted with all cores.
+
+    Returns:
+        tuple: (fitted model, chosen parameters, best cross-validation R^2 or None)
+    """
+    params = dict(DEFAULT_PARAMS)
+    cv_score = None
+    if grid_search:
+        search = GridSearchCV(RandomForestRegressor(random_state=DEFAULT_PARAMS['random_state'], n_jobs=1),
+                              PARAM_GRID, cv=5, n_jobs=jobs, refit=False)
+        search.fit(X, y)
+        params.update(search.best_params_)
+        cv_score = float(search.best_score_)
+
+    model = RandomForestRegressor(n_jobs=jobs, **params)
+    model.fit(X, y)
+    return model, params, cv_score
+
+
+def time_call(function, repeats):
+    """
+    Return the median wall time of function() in milliseconds.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(float(np.median(timings)), 3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the lap time random forest from cleaned CSVs.")
+    parser.add_argument("inputs", nargs="*", default=DEFAULT_INPUTS, help="cleaned CSV files or glob patterns")
+    parser.add_argument("--output", default=None,
+                        help=f"path of the pickled model (default: {os.path.basename(CANDIDATE_PATH)})")
+    parser.add_argument("--replace-served-model", action="store_true",
+                        help=f"write to the model the website serves ({os.path.basename(MODEL_PATH)})")
+    parser.add_argument("--grid-search", action="store_true", help="run a process-parallel grid search first")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel jobs (-1: all cores)")
+    parser.add_argument("--report", default=REPORT_PATH, help="path of the JSON training report")
+    args = parser.parse_args(argv)
+    if args.replace_served_model:
+        if args.output is not None and os.path.abspath(args.output) != MODEL_PATH:
+            parser.error("--output and --replace-served-model cannot be combined")
+        args.output = MODEL_PATH
+    elif args.output is None:
+        args.output = CANDIDATE_PATH
+    elif os.path.abspath(args.output) == MODEL_PATH:
+        parser.error("refusing to overwrite the served model without --replace-served-model")
+
+    csv_paths = sorted({path for pattern in args.inputs for path in glob.glob(pattern)})
+    if not csv_paths:
+        print("No input files matched:", ", ".join(args.inputs))
+        return
+
+    start = time.perf_counter()
+    X, y, cache_hit = load_features(csv_paths)
+    feature_seconds = time.perf_counter() - start
+    print(f"Features: {X.shape[0]} rows from {len(csv_paths)} files "
+          f"({'cache hit' if cache_hit else 'built'}, {feature_seconds:.3f} s)")
+
+    # Hold out a test split for the report; the emitted model is trained on all rows.
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    start = time.perf_counter()
+    model, params, cv_score = fit_model(X_train, y_train, args.grid_search, args.jobs)
+    holdout_r2 = float(model.score(X_test, y_test))
+    # Refit the chosen parameters on all rows for the emitted model.
+    model = RandomForestRegressor(n_jobs=args.jobs, **params).fit(X, y)
+    train_seconds = time.perf_counter() - start
+    print(f"Trained with {params} in {train_seconds:.2f} s, hold-out R^2 {holdout_r2:.4f}")
+
+    # The website predicts one request at a time; do not start worker threads per prediction.
+    model.set_params(n_jobs=None)
+    # Export the flat forest before moving the pickle into place, so a running website that
+    # notices the new pickle finds a matching export.
+    tmp_path = f"{args.output}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(model, f)
+    flat_dir = os.path.splitext(args.output)[0] + '.flat'
+    forest = FlatForest.from_estimator(model)
+    # Renaming the temporary file keeps the size and modification time recorded here.
+    forest.save(flat_dir, source=describe_source(tmp_path))
+    os.replace(tmp_path, args.output)
+    print(f"Model written to {args.output} and {flat_dir}")
+
+    row, batch = X[:1], X[:min(len(X), 1000)]
+    report = {
+        "inputs": csv_paths,
+        "rows": int(X.shape[0]),
+        "feature_cache_hit": cache_hit,
+        "feature_seconds": round(feature_seconds, 3),
+        "params": params,
+        "grid_search": args.grid_search,
+        "cv_r2": cv_score,
+        "holdout_r2": round(holdout_r2, 4),
+        "train_seconds": round(train_seconds, 3),
+        "inference_ms": {
+            "sklearn_single_row": time_call(lambda: model.predict(row), 50),
+            "flat_single_row": time_call(lambda: forest.predict(row), 50),
+            f"sklearn_{len(batch)}_rows": time_call(lambda: model.predict(batch), 5),
+            f"flat_{len(batch)}_rows": time_call(lambda: forest.predict(batch), 5),
+        },
+        "model_bytes": os.path.getsize(args.output),
+    }
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["inference_ms"], indent=2))
+    print(f"Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
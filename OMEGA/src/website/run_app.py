@@ -1,9 +1,16 @@
 import os
 import sys
 import json
+import argparse
 import subprocess
 import time
 
+# Conditions used to warm up the model before the production workers are forked.
+WARMUP_CONDITIONS = {
+    "st_speed": 310, "compound": "Soft", "air_temperature": 25,
+    "rainfall": 0, "wind_direction": 180, "wind_speed": 3
+}
+
 
 def load_config():
     """
@@ -20,7 +27,8 @@ def load_config():
     if not os.path.exists(config_path):
         default_config = {
             "backend": {"host": "127.0.0.1", "port": 5000},
-            "frontend": {"host": "localhost", "port": 8000}
+            "frontend": {"host": "localhost", "port": 8000},
+            "production": {"bind": "127.0.0.1:8080", "workers": 4}
         }
         with open(config_path, "w") as f:
             json.dump(default_config, f, indent=2)
@@ -35,6 +43,8 @@ def load_config():
 
 # Get the absolute path to the website directory.
 website_dir = os.path.abspath(os.path.dirname(__file__))
+# The backend imports the model as OMEGA.src.website..., so the repository root must be importable.
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(website_dir)))
 print(f"Website directory: {website_dir}")
 
 # Load configuration for backend and frontend servers.
@@ -43,6 +53,9 @@ backend_host = config["backend"]["host"]
 backend_port = config["backend"]["port"]
 frontend_host = config["frontend"]["host"]
 frontend_port = config["frontend"]["port"]
+production_config = config.get("production", {})
+production_bind = production_config.get("bind", "127.0.0.1:8080")
+production_workers = production_config.get("workers", 4)
 
 
 def run_backend():
@@ -57,7 +70,8 @@ def run_backend():
     backend_process = subprocess.Popen(
         [sys.executable, "-m", "flask", "run", "--host", backend_host, "--port", str(backend_port)],
         cwd=website_dir,
-        env={**os.environ, "FLASK_APP": "backend.views.app"}
+        env={**os.environ, "FLASK_APP": "backend.views.app",
+             "PYTHONPATH": os.pathsep.join(filter(None, [repo_root, os.environ.get("PYTHONPATH")]))}
     )
     return backend_process
 
@@ -82,11 +96,69 @@ def run_frontend():
     return frontend_process
 
 
+def run_production():
+    """
+    Serve the API and the frontend files from one pre-forking gunicorn server.
+
+    The Flask app (and with it the prediction model and the performance metrics) is imported and
+    warmed up in the master process before the workers are forked, so the workers share those pages
+    copy-on-write instead of each loading its own copy. Worker count and bind address come from the
+    "production" section of config.json.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("Production mode needs gunicorn: pip install gunicorn")
+        sys.exit(1)
+
+    class ProductionServer(BaseApplication):
+        """
+        Minimal gunicorn application serving an already imported WSGI app.
+        """
+
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    sys.path.insert(0, repo_root)
+    from OMEGA.src.website.backend.views.app import app, predict_controller
+
+    # Warm up the model and the team metrics once, before forking. The scikit-learn estimator used
+    # for large batches and grids is loaded here too, so the workers do not each unpickle a copy.
+    predict_controller.predict_performance(WARMUP_CONDITIONS)
+    predict_controller.model.load_estimator()
+
+    print(f"Starting production server on {production_bind} with {production_workers} workers...")
+    print(f"Website: http://{production_bind}/")
+    ProductionServer(app, {
+        "bind": production_bind,
+        "workers": production_workers,
+        "preload_app": True,
+    }).run()
+
+
 def main():
     """
     Main function to start both backend and frontend servers.
     The servers will keep running until a KeyboardInterrupt (Ctrl+C) is received.
+    With --production a single multi-worker server serves both the API and the frontend.
     """
+    parser = argparse.ArgumentParser(description="Run the OMEGA website.")
+    parser.add_argument("--production", action="store_true",
+                        help="serve API and frontend from one pre-forking gunicorn server")
+    args = parser.parse_args()
+    if args.production:
+        run_production()
+        return
+
     # Launch the backend server.
     backend_process = run_backend()
     # Allow some time for the backend to start up.